@@ -11,12 +11,17 @@
 
 
 # Import libraries
+import os
 import SimpleITK as sitk
 import itk
 import numpy as np
+import scipy.ndimage
+import scipy.sparse
+from concurrent.futures import ThreadPoolExecutor
 
 import niftymic.base.slice as sl
 import niftymic.base.stack as st
+import niftymic.registration.slice_warping as sw
 import niftymic.utilities.intensity_correction as ic
 # Import modules
 import pysitk.simple_itk_helper as sitkh
@@ -74,11 +79,25 @@ class IntraStackRegistration(StackRegistrationBase):
     #                                                            used in
     #                                                            "scipy.optimize.minimize",
     #                                                            e.g.
-    #                                                            "L-BFGS-B".
+    #                                                            "L-BFGS-B",
+    #                                                            or
+    #                                                            "gauss_newton"
+    #                                                            to use a
+    #                                                            damped
+    #                                                            Gauss-Newton
+    #                                                            solver on the
+    #                                                            sparse normal
+    #                                                            equations
     # \param      optimizer_iter_max                             Maximum number
     #                                                            of
     #                                                            iterations/function
+    #                                                            evaluations;
+    #                                                            function
     #                                                            evaluations
+    #                                                            for
+    #                                                            "least_squares"
+    #                                                            and
+    #                                                            "gauss_newton"
     # \param      optimizer_loss                                 Loss function,
     #                                                            e.g. "linear",
     #                                                            "soft_l1" or
@@ -89,6 +108,17 @@ class IntraStackRegistration(StackRegistrationBase):
     #                                                            "least_squares"
     #                                                            algorithm.
     #                                                            E.g. "trf"
+    # \param      optimizer_tr_solver                            Solver for
+    #                                                            trust-region
+    #                                                            subproblems
+    #                                                            of
+    #                                                            "least_squares",
+    #                                                            i.e. "exact"
+    #                                                            or "lsmr". The
+    #                                                            latter
+    #                                                            exploits
+    #                                                            sparse
+    #                                                            Jacobians.
     # \param      use_parameter_normalization                    Use parameter
     #                                                            normalization
     #                                                            for optimizer,
@@ -122,6 +152,32 @@ class IntraStackRegistration(StackRegistrationBase):
     #                                                            "identity",
     #                                                            "gradient_magnitude",
     #                                                            "partial_derivative"
+    # \param      n_threads                                      Number of
+    #                                                            threads used
+    #                                                            to process
+    #                                                            the slices
+    #                                                            independently;
+    #                                                            None uses all
+    #                                                            available
+    #                                                            cores, 1
+    #                                                            processes
+    #                                                            them serially
+    # \param      use_multiresolution_framework                  Solve the
+    #                                                            slice
+    #                                                            neighbour fit
+    #                                                            from coarse to
+    #                                                            fine
+    #                                                            resolution
+    #                                                            levels, bool
+    # \param      shrink_factors                                 Shrink factors
+    #                                                            of the
+    #                                                            resolution
+    #                                                            levels
+    # \param      smoothing_sigmas                               Smoothing
+    #                                                            sigmas in mm
+    #                                                            of the
+    #                                                            resolution
+    #                                                            levels
     #
     def __init__(self,
                  stack=None,
@@ -139,12 +195,17 @@ class IntraStackRegistration(StackRegistrationBase):
                  optimizer_iter_max=20,
                  optimizer_loss="soft_l1",
                  optimizer_method="trf",
+                 optimizer_tr_solver="exact",
                  use_parameter_normalization=False,
                  intensity_correction_initializer_type=None,
                  intensity_correction_type_slice_neighbour_fit=None,
                  prior_intensity_correction_coefficients=np.array([1, 0]),
                  prior_scale=1.0,
                  image_transform_reference_fit_term="identity",
+                 n_threads=None,
+                 use_multiresolution_framework=False,
+                 shrink_factors=[2, 1],
+                 smoothing_sigmas=[1, 0],
                  ):
 
         # Run constructor of superclass
@@ -161,10 +222,14 @@ class IntraStackRegistration(StackRegistrationBase):
             optimizer_iter_max=optimizer_iter_max,
             optimizer_loss=optimizer_loss,
             optimizer_method=optimizer_method,
+            optimizer_tr_solver=optimizer_tr_solver,
             interpolator=interpolator,
             alpha_neighbour=alpha_neighbour,
             alpha_reference=alpha_reference,
             alpha_parameter=alpha_parameter,
+            use_multiresolution_framework=use_multiresolution_framework,
+            shrink_factors=shrink_factors,
+            smoothing_sigmas=smoothing_sigmas,
         )
 
         # Chosen transform type
@@ -183,6 +248,14 @@ class IntraStackRegistration(StackRegistrationBase):
             "affine": self._new_affine_transform_itk
         }
 
+        # Dictionary to get the matrices of the transforms from the
+        # parameters depending on the chosen transform type
+        self._get_transforms_2D_matrices_nda = {
+            "rigid": self._get_rigid_transforms_2D_matrices_nda,
+            "similarity": self._get_similarity_transforms_2D_matrices_nda,
+            "affine": self._get_affine_transforms_2D_matrices_nda
+        }
+
         # Chosen intensity correction type
         self._intensity_correction_type_slice_neighbour_fit = \
             intensity_correction_type_slice_neighbour_fit
@@ -267,6 +340,9 @@ class IntraStackRegistration(StackRegistrationBase):
         self._use_stack_mask_reference_fit_term = self._use_stack_mask
         self._use_stack_mask_neighbour_fit_term = self._use_stack_mask
 
+        self.set_n_threads(n_threads)
+        self.use_multiresolution_framework(use_multiresolution_framework)
+
     ##
     # Sets the transform type.
     # \date       2016-11-10 01:53:58+0000
@@ -284,6 +360,59 @@ class IntraStackRegistration(StackRegistrationBase):
     def get_transform_type(self):
         return self._transform_type
 
+    ##
+    # Sets the number of threads used to process the slices independently,
+    # e.g. to create the projected 2D slices or to apply the obtained motion
+    # correction.
+    # \date       2026-10-15 16:02:47+0100
+    #
+    # Use n_threads=1 to fall back to serial processing, e.g. in case the
+    # used SimpleITK build is not thread-safe.
+    #
+    # \param      self       The object
+    # \param      n_threads  Number of threads; None uses all available cores
+    #
+    def set_n_threads(self, n_threads):
+        if n_threads is None:
+            n_threads = os.cpu_count() or 1
+        if n_threads < 1:
+            raise ValueError("Number of threads must be at least 1")
+        self._n_threads = n_threads
+
+    def get_n_threads(self):
+        return self._n_threads
+
+    ##
+    # Use multiresolution framework, i.e. the slice neighbour fit is solved
+    # on smoothed and downsampled slices first and the result is used to
+    # warm-start the next finer resolution level.
+    # \date       2026-10-16 10:52:18+0100
+    #
+    # Only supported for the slice neighbour fit, i.e. without reference,
+    # using linear interpolation.
+    #
+    # \param      self  The object
+    # \param      flag  The flag, boolean
+    #
+    def use_multiresolution_framework(self, flag):
+        if flag:
+            self._check_multiresolution_framework_support()
+        self._use_multiresolution_framework = flag
+
+    ##
+    # Raises a ValueError in case the current settings do not support the
+    # multiresolution framework.
+    # \date       2026-10-16 10:53:40+0100
+    #
+    # \param      self  The object
+    #
+    def _check_multiresolution_framework_support(self):
+        if self._reference is not None or \
+                self._interpolator not in ["Linear"]:
+            raise ValueError(
+                "Multiresolution framework is only supported for the slice "
+                "neighbour fit using linear interpolation")
+
     ##
     # Set the intensity correction type
     # \date       2016-11-10 01:58:39+0000
@@ -452,6 +581,8 @@ class IntraStackRegistration(StackRegistrationBase):
     def _print_info_text_least_squares(self):
         print("Minimization via least_squares solver (scipy.optimize.least_squares)")
         print("\tMethod: " + self._optimizer_method)
+        if self._optimizer_method not in ["lm"]:
+            print("\tTrust-region solver: " + self._optimizer_tr_solver)
         print("\tLoss: " + self._optimizer_loss)
         print("\tMaximum number of function evaluations: " +
               str(self._optimizer_iter_max))
@@ -465,6 +596,13 @@ class IntraStackRegistration(StackRegistrationBase):
               str(self._optimizer_iter_max))
         self._print_into_text_common()
 
+    def _print_info_text_gauss_newton(self):
+        print("Minimization via Levenberg-Marquardt damped Gauss-Newton solver")
+        print("\tLoss: " + self._optimizer_loss)
+        print("\tMaximum number of iterations: " +
+              str(self._optimizer_iter_max))
+        self._print_into_text_common()
+
     def _print_into_text_common(self):
         print("\tTransform type: " + self._transform_type +
               " (Initialization: " + str(self._transform_initializer_type) + ")")
@@ -581,7 +719,7 @@ class IntraStackRegistration(StackRegistrationBase):
                     np.array(self._reference.sitk.GetSize())[::-1])
                 for i in range(0, self._N_slices):
                     self._gradient_magnitude_reference_nda[i, :, :] = \
-                        sitk.GetArrayFromImage(
+                        sitk.GetArrayViewFromImage(
                             self._init_slices_2D_reference[i].sitk)
 
             # ||dx(slice_i)(T(theta_i)) - dx(ref)|| + ||dy(slice_i)(T(theta_i)) - dy(ref)||
@@ -624,10 +762,12 @@ class IntraStackRegistration(StackRegistrationBase):
                     np.array(self._reference.sitk.GetSize())[::-1])
                 self._dy_reference_nda = np.zeros_like(self._dx_reference_nda)
                 for i in range(0, self._N_slices):
-                    self._dx_reference_nda[i, :, :] = sitk.GetArrayFromImage(
-                        dx_slices_2D_reference[i].sitk)
-                    self._dy_reference_nda[i, :, :] = sitk.GetArrayFromImage(
-                        dy_slices_2D_reference[i].sitk)
+                    self._dx_reference_nda[i, :, :] = \
+                        sitk.GetArrayViewFromImage(
+                            dx_slices_2D_reference[i].sitk)
+                    self._dy_reference_nda[i, :, :] = \
+                        sitk.GetArrayViewFromImage(
+                            dy_slices_2D_reference[i].sitk)
 
             # Resampling grid, i.e. the fixed image space during registration
             self._slice_grid_2D_sitk = sitk.Image(
@@ -637,19 +777,40 @@ class IntraStackRegistration(StackRegistrationBase):
             # Resampling grid, i.e. the fixed image space during registration
             self._slice_grid_2D_sitk = sitk.Image(self._slices_2D[0].sitk)
 
+        # Precompute data arrays and geometry used for residual evaluation
+        self._precompute_slices_2D_nda(
+            [s.sitk for s in self._slices_2D],
+            [s.sitk_mask for s in self._slices_2D],
+            self._slice_grid_2D_sitk)
+
+        # Resample filters bound to the resampling grid
+        self._resampler_sitk = self._get_resampler_sitk(
+            self._interpolator_sitk)
+        self._resampler_mask_sitk = self._get_resampler_sitk(
+            sitk.sitkNearestNeighbor)
+
         # Get inital transform and the respective initial transform parameters
         # used for further optimisation
-        self._transforms_2D_sitk, parameters = \
+        self._transforms_2D_sitk, parameters_transform = \
             self._get_initial_transforms_and_parameters[
                 self._transform_initializer_type]()
 
+        # Assemble transform and intensity correction parameters in place
         if self._intensity_correction_type_slice_neighbour_fit is not None:
             parameters_intensity = \
                 self._get_initial_intensity_correction_parameters[
                     self._intensity_correction_initializer_type]()
-            parameters = np.concatenate(
-                (parameters, parameters_intensity),
-                axis=1)
+            parameters = np.zeros((
+                self._N_slices,
+                self._transform_type_dofs + parameters_intensity.shape[1]))
+            parameters[:, 0:self._transform_type_dofs] = parameters_transform
+            parameters[:, self._transform_type_dofs:] = parameters_intensity
+        else:
+            parameters = parameters_transform
+
+        # Centers of the transforms remain fixed during optimisation
+        self._transforms_2D_center = np.array(
+            [t.GetCenter() for t in self._transforms_2D_sitk])
 
         # Parameters for initialization and for regularization term
         self._parameters0_vec = parameters.flatten()
@@ -792,7 +953,7 @@ class IntraStackRegistration(StackRegistrationBase):
         if alpha_parameter > self._ZERO:
             if self._transform_type in ["similarity"]:
                 self._get_jacobian_residual_parameters = \
-                    lambda x: np.concatenate((
+                    lambda x: scipy.sparse.vstack((
                         self._get_jacobian_residual_scale(x),
                         self._get_jacobian_residual_intensity_coefficients[
                             self._intensity_correction_type_slice_neighbour_fit](x)
@@ -817,7 +978,7 @@ class IntraStackRegistration(StackRegistrationBase):
                         x)
 
             else:
-                jacobian = lambda x: np.concatenate((
+                jacobian = lambda x: scipy.sparse.vstack((
                     self._get_jacobian_residual_slice_neighbours_fit(x),
                     alpha_parameter / alpha_neighbour *
                     self._get_jacobian_residual_parameters(x)
@@ -837,7 +998,7 @@ class IntraStackRegistration(StackRegistrationBase):
 
             elif self._image_transform_reference_fit_term in ["partial_derivative"]:
                 self._get_jacobian_residual_reference_fit_total = \
-                    lambda x: np.concatenate((
+                    lambda x: scipy.sparse.vstack((
                         self._get_jacobian_residual_reference_fit(
                             self._slices_2D, "dx", x),
                         self._get_jacobian_residual_reference_fit(
@@ -854,21 +1015,21 @@ class IntraStackRegistration(StackRegistrationBase):
                         x)
 
             elif alpha_neighbour > self._ZERO and alpha_parameter < self._ZERO:
-                jacobian = lambda x: np.concatenate((
+                jacobian = lambda x: scipy.sparse.vstack((
                     self._get_jacobian_residual_reference_fit_total(x),
                     alpha_neighbour / alpha_reference *
                     self._get_jacobian_residual_slice_neighbours_fit(x)
                 ))
 
             elif alpha_neighbour < self._ZERO and alpha_parameter > self._ZERO:
-                jacobian = lambda x: np.concatenate((
+                jacobian = lambda x: scipy.sparse.vstack((
                     self._get_jacobian_residual_reference_fit_total(x),
                     alpha_parameter / alpha_reference *
                     self._get_jacobian_residual_parameters(x)
                 ))
 
             elif alpha_neighbour > self._ZERO and alpha_parameter > self._ZERO:
-                jacobian = lambda x: np.concatenate((
+                jacobian = lambda x: scipy.sparse.vstack((
                     self._get_jacobian_residual_reference_fit_total(x),
                     alpha_neighbour / alpha_reference *
                     self._get_jacobian_residual_slice_neighbours_fit(x),
@@ -912,17 +1073,15 @@ class IntraStackRegistration(StackRegistrationBase):
             # Get slice_i(T(theta_i, x))
             self._transforms_2D_sitk[i].SetParameters(
                 parameters[i, 0:self._transform_type_dofs])
-            slice_i_sitk = sitk.Resample(
+            slice_i_sitk = self._resample_image_sitk(
                 slices_2D[i].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                self._interpolator_sitk)
+                self._transforms_2D_sitk[i])
 
             # Apply image transform, i.e. gradients etc
             slice_i_sitk = self._apply_image_transform[trafo](slice_i_sitk)
 
-            # Extract data array
-            slice_i_nda = sitk.GetArrayFromImage(slice_i_sitk)
+            # Extract data array (read-only view of slice_i_sitk)
+            slice_i_nda = sitk.GetArrayViewFromImage(slice_i_sitk)
 
             # Correct intensities according to chosen model
             slice_i_nda = self._apply_intensity_correction[
@@ -934,12 +1093,11 @@ class IntraStackRegistration(StackRegistrationBase):
 
             # Incorporate mask computations
             if self._use_stack_mask_reference_fit_term:
-                slice_i_sitk_mask = sitk.Resample(
+                slice_i_sitk_mask = self._resample_mask_sitk(
                     slices_2D[i].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i],
-                    sitk.sitkNearestNeighbor)
-                slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
+                    self._transforms_2D_sitk[i])
+                slice_i_nda_mask = sitk.GetArrayViewFromImage(
+                    slice_i_sitk_mask)
                 residual_slice_nda *= slice_i_nda_mask
 
             if self._use_reference_mask:
@@ -964,21 +1122,16 @@ class IntraStackRegistration(StackRegistrationBase):
     # \param      parameters_vec  The parameters vector
     #
     # \return     The jacobian residual reference fit as [N_slices *
-    #             N_slice_voxels] x [transform_type_dofs * N_slices] numpy
-    #             array
+    #             N_slice_voxels] x [optimization_dofs * N_slices] block
+    #             diagonal sparse matrix
     #
     def _get_jacobian_residual_reference_fit(self,
                                              slices_2D,
                                              trafo,
                                              parameters_vec):
 
-        # Allocate memory for Jacobian of residual
-        jacobian = np.zeros(
-            (self._N_slices * self._N_slice_voxels,
-                self._optimization_dofs * self._N_slices))
-
-        jacobian_slice_i = np.zeros(
-            (self._N_slice_voxels, self._optimization_dofs))
+        # Diagonal blocks of Jacobian of residual
+        jacobian_slices = [None] * self._N_slices
 
         # Reshape parameters for easier access
         parameters = parameters_vec.reshape(-1, self._optimization_dofs)
@@ -993,11 +1146,9 @@ class IntraStackRegistration(StackRegistrationBase):
                 itk.OptimizerParameters[itk.D](parameters_slice))
 
             # Get slice_i(T(theta, x))
-            slice_i_sitk = sitk.Resample(
+            slice_i_sitk = self._resample_image_sitk(
                 slices_2D[i].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                self._interpolator_sitk)
+                self._transforms_2D_sitk[i])
 
             # Apply image transform, i.e. gradients etc
             slice_i_sitk = self._apply_image_transform[trafo](slice_i_sitk)
@@ -1013,12 +1164,11 @@ class IntraStackRegistration(StackRegistrationBase):
             # Incorporate mask computations
             if self._use_stack_mask_reference_fit_term:
                 # Slice mask
-                slice_i_sitk_mask = sitk.Resample(
+                slice_i_sitk_mask = self._resample_mask_sitk(
                     slices_2D[i].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i],
-                    sitk.sitkNearestNeighbor)
-                slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
+                    self._transforms_2D_sitk[i])
+                slice_i_nda_mask = sitk.GetArrayViewFromImage(
+                    slice_i_sitk_mask)
 
                 # Mask data
                 slice_i_nda *= slice_i_nda_mask
@@ -1053,17 +1203,277 @@ class IntraStackRegistration(StackRegistrationBase):
             # Second dimension is decided by intensity_correction_type_slice_neighbour_fit
             # as being of "higher order"
             # (e.g. affine for slice fit term and linear for reference fit term)
+            jacobian_slice_i = np.zeros(
+                (self._N_slice_voxels, self._optimization_dofs))
             jacobian_slice_i[:, 0:jacobian_slice_i_tmp.shape[
                 1]] = jacobian_slice_i_tmp
 
             # Set elements in Jacobian for entire stack
-            jacobian[
-                i * self._N_slice_voxels:
-                (i + 1) * self._N_slice_voxels,
-                i * self._optimization_dofs:
-                (i + 1) * self._optimization_dofs] = jacobian_slice_i
+            jacobian_slices[i] = jacobian_slice_i
 
-        return jacobian
+        return scipy.sparse.block_diag(jacobian_slices, format="csr")
+
+    ##
+    # Precompute the slice data arrays and the geometric information required
+    # to evaluate slice_i(T(theta_i, x)) on the resampling grid without
+    # SimpleITK resampling calls.
+    # \date       2026-10-15 09:12:31+0100
+    #
+    # \param      self                The object
+    # \param      slices_2D_sitk      The 2D slices as list of sitk.Image
+    #                                 objects
+    # \param      slices_2D_sitk_mask  The 2D slice masks as list of
+    #                                 sitk.Image objects
+    # \param      slice_grid_2D_sitk  The resampling grid as sitk.Image
+    # \post       self._slices_2D_nda and self._slices_2D_nda_mask hold the
+    #             (N_slices x Ny x Nx) data arrays of the projected 2D slices
+    #
+    def _precompute_slices_2D_nda(self,
+                                  slices_2D_sitk,
+                                  slices_2D_sitk_mask,
+                                  slice_grid_2D_sitk):
+
+        # Stack data arrays of all slices into contiguous arrays. Single
+        # precision halves the memory traffic of the (memory-bound) warping
+        self._slices_2D_nda = np.array(
+            [sitk.GetArrayViewFromImage(s) for s in slices_2D_sitk],
+            dtype=np.float32)
+        self._slices_2D_nda_mask = np.array(
+            [sitk.GetArrayViewFromImage(s) for s in slices_2D_sitk_mask])
+
+        # Voxel indices (2 x N_grid_voxels) of the resampling grid in
+        # (x, y)-order and the map from voxel to physical space
+        shape = np.array(slice_grid_2D_sitk.GetSize())[::-1]
+        self._slice_grid_2D_shape = tuple(shape)
+        self._slice_grid_2D_indices = np.indices(shape).reshape(2, -1)[::-1]
+        self._slice_grid_2D_index_to_physical = \
+            np.array(slice_grid_2D_sitk.GetDirection()).reshape(2, 2) * \
+            np.array(slice_grid_2D_sitk.GetSpacing())
+        self._slice_grid_2D_origin = np.array(slice_grid_2D_sitk.GetOrigin())
+        self._slice_grid_2D_spacing = np.array(
+            slice_grid_2D_sitk.GetSpacing())
+        self._slice_grid_2D_direction = np.array(
+            slice_grid_2D_sitk.GetDirection()).reshape(2, 2)
+
+        # Constant coordinate factors (1, x, y) of the Jacobian
+        # d[T(theta_i, x)]/dtheta_i = J_i + x * Jx_i + y * Jy_i for all
+        # physical points (x, y) of the resampling grid as
+        # (N_grid_voxels x 3)-array
+        points = self._slice_grid_2D_index_to_physical.dot(
+            self._slice_grid_2D_indices) + \
+            self._slice_grid_2D_origin[:, np.newaxis]
+        self._slice_grid_2D_points = np.ones((points.shape[1], 3))
+        self._slice_grid_2D_points[:, 1:] = points.transpose()
+
+        # Buffers for the warped slices and masks which are reused across
+        # Jacobian evaluations (and residual evaluations without numba)
+        shape_warped = (self._N_slices,) + self._slice_grid_2D_shape
+        self._warped_slices_2D_nda = np.empty(
+            shape_warped, dtype=self._slices_2D_nda.dtype)
+        self._warped_slices_2D_nda_mask = np.empty(
+            shape_warped, dtype=self._slices_2D_nda_mask.dtype)
+
+        # Maps from physical to (continuous) voxel space for each slice
+        self._slices_2D_physical_to_index = np.zeros((self._N_slices, 2, 2))
+        self._slices_2D_origin = np.zeros((self._N_slices, 2))
+        for i in range(0, self._N_slices):
+            A = np.array(slices_2D_sitk[i].GetDirection()).reshape(2, 2) \
+                * np.array(slices_2D_sitk[i].GetSpacing())
+            self._slices_2D_physical_to_index[i, :, :] = np.linalg.inv(A)
+            self._slices_2D_origin[i, :] = slices_2D_sitk[i].GetOrigin()
+
+    ##
+    # Sets the resolution level of the multiresolution framework, i.e. the
+    # data arrays and resampling grid used for the slice neighbour fit are
+    # computed from smoothed and shrunk slices.
+    # \date       2026-10-15 18:31:52+0100
+    #
+    # Since all parameters are given in physical units, the parameters of
+    # one level directly serve as initial value for the next level.
+    #
+    # \param      self             The object
+    # \param      shrink_factor    Shrink factor of slices and resampling
+    #                              grid, integer >= 1
+    # \param      smoothing_sigma  Standard deviation in physical units of
+    #                              the Gaussian smoothing applied before
+    #                              shrinking
+    #
+    def _set_multiresolution_level(self, shrink_factor, smoothing_sigma):
+
+        # Reference or interpolator may have been changed after the
+        # multiresolution framework was chosen
+        self._check_multiresolution_framework_support()
+
+        slices_2D_sitk = [s.sitk for s in self._slices_2D]
+        slices_2D_sitk_mask = [s.sitk_mask for s in self._slices_2D]
+        slice_grid_2D_sitk = self._slice_grid_2D_sitk
+
+        if smoothing_sigma > 0:
+            slices_2D_sitk = [
+                sitk.SmoothingRecursiveGaussian(s, smoothing_sigma)
+                for s in slices_2D_sitk]
+
+        # Shrink all images by binning so that slices, masks and resampling
+        # grid share the same geometry. Masks keep voxels which are covered
+        # by at least half of their bin.
+        if shrink_factor > 1:
+            shrink_factors = [shrink_factor] * 2
+            slices_2D_sitk = [
+                sitk.BinShrink(s, shrink_factors) for s in slices_2D_sitk]
+            slices_2D_sitk_mask = [
+                sitk.BinShrink(
+                    sitk.Cast(s > 0, sitk.sitkFloat32), shrink_factors) >= 0.5
+                for s in slices_2D_sitk_mask]
+            slice_grid_2D_sitk = sitk.BinShrink(
+                slice_grid_2D_sitk, shrink_factors)
+
+        self._precompute_slices_2D_nda(
+            slices_2D_sitk, slices_2D_sitk_mask, slice_grid_2D_sitk)
+
+    ##
+    # Gets the affine maps from voxel indices of the resampling grid to
+    # continuous voxel indices of T(theta_i, x) within slice_i for all slices
+    # i.
+    # \date       2026-10-15 09:20:04+0100
+    #
+    # \param      self        The object
+    # \param      parameters  The parameters as (N_slices x DOF)-array
+    #
+    # \return     Matrices as (N_slices x 2 x 2) and offsets as (N_slices x 2)
+    #             numpy arrays in (x, y)-order
+    #
+    def _get_slices_2D_index_maps(self, parameters):
+
+        # T(theta_i, x) = A_i (x - c_i) + c_i + t_i = A_i x + b_i in physical
+        # space
+        matrices = self._get_transforms_2D_matrices_nda[
+            self._transform_type](parameters)
+        offsets = self._transforms_2D_center + \
+            parameters[:, self._transform_type_dofs - 2:
+                       self._transform_type_dofs] - \
+            np.einsum("nij,nj->ni", matrices, self._transforms_2D_center)
+
+        # Compose with the index-to-physical map of the resampling grid and
+        # the physical-to-index maps of the slices
+        offsets += matrices.dot(self._slice_grid_2D_origin)
+        matrices = matrices.dot(self._slice_grid_2D_index_to_physical)
+        matrices = np.einsum(
+            "nij,njk->nik", self._slices_2D_physical_to_index, matrices)
+        offsets = np.einsum(
+            "nij,nj->ni", self._slices_2D_physical_to_index,
+            offsets - self._slices_2D_origin)
+
+        return matrices, offsets
+
+    ##
+    # Decides whether the compiled kernels of slice_warping can be used for
+    # the given index maps.
+    # \date       2026-10-16 09:12:37+0100
+    #
+    # Non-finite index maps, e.g. after a diverging optimizer step, are
+    # handled by the numpy-based implementation which yields NaN intensities
+    # similar to SimpleITK.
+    #
+    # \param      self      The object
+    # \param      matrices  Matrices of the index maps as (N_slices x 2 x 2)
+    #                       numpy array
+    # \param      offsets   Offsets of the index maps as (N_slices x 2) numpy
+    #                       array
+    #
+    # \return     True if the compiled kernels shall be used, False otherwise
+    #
+    @staticmethod
+    def _use_numba_kernels(matrices, offsets):
+        return sw.USE_NUMBA and \
+            np.isfinite(matrices).all() and np.isfinite(offsets).all()
+
+    ##
+    # Gets the intensity correction of each slice as scale and bias.
+    # \date       2026-10-15 11:31:05+0100
+    #
+    # \param      self        The object
+    # \param      parameters  The parameters as (N_slices x DOF)-array
+    #
+    # \return     The intensity correction as (N_slices x 2) numpy array
+    #
+    def _get_intensity_correction_scale_and_bias(self, parameters):
+        intensity = np.zeros((self._N_slices, 2))
+        intensity[:, 0] = 1
+        coefficients = parameters[:, self._transform_type_dofs:]
+        intensity[:, 0:coefficients.shape[1]] = coefficients
+        return intensity
+
+    ##
+    # Gets slice_i(T(theta_i, x)) for all slices i by a single batched linear
+    # interpolation, i.e. equivalent to sitk.Resample with sitk.sitkLinear.
+    # \date       2026-10-15 09:31:47+0100
+    #
+    # Voxels mapped outside the slice domain are set to zero (ITK default
+    # value). Masks are resampled using nearest neighbour interpolation.
+    #
+    # \param      self        The object
+    # \param      parameters  The parameters as (N_slices x DOF)-array
+    #
+    # \return     The warped slices and slice masks as (N_slices x Ny x Nx)
+    #             numpy arrays. They are written to preallocated buffers
+    #             and hence overwritten by the next call.
+    #
+    def _get_warped_slices_2D_nda(self, parameters):
+
+        shape_nda = self._slices_2D_nda.shape
+        shape_out = (self._N_slices,) + self._slice_grid_2D_shape
+
+        matrices, offsets = self._get_slices_2D_index_maps(parameters)
+
+        slices_nda = self._warped_slices_2D_nda
+        slices_nda_mask = self._warped_slices_2D_nda_mask
+
+        if self._use_numba_kernels(matrices, offsets):
+            sw.warp_slices(
+                self._slices_2D_nda,
+                self._slices_2D_nda_mask,
+                matrices,
+                offsets,
+                slices_nda,
+                slices_nda_mask)
+            return slices_nda, slices_nda_mask
+
+        # Continuous voxel indices (N_slices x 2 x N_grid_voxels) of
+        # T(theta_i, x) within slice_i
+        cindices = np.einsum(
+            "nij,jk->nik", matrices, self._slice_grid_2D_indices) + \
+            offsets[:, :, np.newaxis]
+
+        # Points outside the slice domain [-0.5, size-0.5) are not considered
+        size = np.array(shape_nda[1:][::-1]).reshape(1, 2, 1)
+        inside = np.all((cindices >= -0.5) & (cindices < size - 0.5), axis=1)
+
+        # Coordinates (slice, y, x) for a single interpolation over all slices
+        coordinates = np.empty((3,) + cindices[:, 0, :].shape)
+        coordinates[0] = np.arange(self._N_slices)[:, np.newaxis]
+        coordinates[1] = cindices[:, 1, :]
+        coordinates[2] = cindices[:, 0, :]
+
+        scipy.ndimage.map_coordinates(
+            self._slices_2D_nda,
+            coordinates.reshape(3, -1),
+            output=slices_nda.reshape(-1),
+            order=1,
+            mode="nearest")
+        slices_nda *= inside.reshape(shape_out)
+
+        # Nearest neighbour interpolation of masks
+        nindices = np.floor(cindices + 0.5).astype(int)
+        nindices = np.clip(nindices, 0, size - 1)
+        np.multiply(
+            self._slices_2D_nda_mask[
+                np.arange(self._N_slices)[:, np.newaxis],
+                nindices[:, 1, :],
+                nindices[:, 0, :]],
+            inside,
+            out=slices_nda_mask.reshape(self._N_slices, -1))
+
+        return slices_nda, slices_nda_mask
 
     ##
     # Gets the residual indicating the alignment between neighbouring slices.
@@ -1072,6 +1482,10 @@ class IntraStackRegistration(StackRegistrationBase):
     # It returns the stacked residual of slice_i(T(theta_i, x)) -
     # slice_{i+1}(T(theta_{i+1}, x)) for all voxels x of all slices i.
     #
+    # All slices are resampled in one batch in case of linear interpolation,
+    # using the compiled kernels of slice_warping if numba is available.
+    # Otherwise, SimpleITK is used for resampling.
+    #
     # \param      self            The object
     # \param      parameters_vec  The parameters vector
     #
@@ -1080,6 +1494,67 @@ class IntraStackRegistration(StackRegistrationBase):
     #
     def _get_residual_slice_neighbours_fit(self, parameters_vec):
 
+        if self._interpolator not in ["Linear"]:
+            return self._get_residual_slice_neighbours_fit_sitk(parameters_vec)
+
+        # Reshape parameters for easier access
+        parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+
+        matrices, offsets = self._get_slices_2D_index_maps(parameters)
+
+        if self._use_numba_kernels(matrices, offsets):
+            # The residual itself is not reused since the optimizer keeps
+            # the residuals of previous evaluations
+            residual = np.empty((self._N_slices - 1,) +
+                                self._slice_grid_2D_shape)
+            sw.get_residual_slice_neighbours_fit(
+                self._slices_2D_nda,
+                self._slices_2D_nda_mask,
+                matrices,
+                offsets,
+                self._get_intensity_correction_scale_and_bias(parameters),
+                self._use_stack_mask_neighbour_fit_term,
+                residual)
+            return residual.ravel()
+
+        # Get slice_i(T(theta_i, x)) for all i
+        slices_nda, slices_nda_mask = self._get_warped_slices_2D_nda(
+            parameters)
+
+        # Correct intensities according to chosen model
+        coefficients = parameters[:, self._transform_type_dofs:].transpose()
+        slices_nda = self._apply_intensity_correction[
+            self._intensity_correction_type_slice_neighbour_fit](
+            slices_nda, coefficients[:, :, np.newaxis, np.newaxis])
+
+        # Compute residuals slice_i(T(theta_i, x)) -
+        # slice_{i+1}(T(theta_{i+1}, x))
+        residual = np.subtract(
+            slices_nda[:-1], slices_nda[1:], dtype=np.float64)
+
+        # Eliminate residual for non-masked regions
+        if self._use_stack_mask_neighbour_fit_term:
+            residual *= slices_nda_mask[:-1]
+            residual *= slices_nda_mask[1:]
+
+        return residual.flatten()
+
+    ##
+    # Gets the residual indicating the alignment between neighbouring slices
+    # based on SimpleITK resampling.
+    # \date       2016-11-21 20:07:41+0000
+    #
+    # It returns the stacked residual of slice_i(T(theta_i, x)) -
+    # slice_{i+1}(T(theta_{i+1}, x)) for all voxels x of all slices i.
+    #
+    # \param      self            The object
+    # \param      parameters_vec  The parameters vector
+    #
+    # \return     The residual slice neighbours fit as
+    #             (N_slices-1) * N_slice_voxels numpy array
+    #
+    def _get_residual_slice_neighbours_fit_sitk(self, parameters_vec):
+
         # Allocate memory for residual
         residual = np.zeros((self._N_slices - 1, self._N_slice_voxels))
 
@@ -1092,12 +1567,10 @@ class IntraStackRegistration(StackRegistrationBase):
         self._transforms_2D_sitk[i].SetParameters(parameters_slice_i)
 
         # Get slice_i(T(theta_i, x)) for i=0
-        slice_i_sitk = sitk.Resample(
+        slice_i_sitk = self._resample_image_sitk(
             self._slices_2D[i].sitk,
-            self._slice_grid_2D_sitk,
-            self._transforms_2D_sitk[i],
-            self._interpolator_sitk)
-        slice_i_nda = sitk.GetArrayFromImage(slice_i_sitk)
+            self._transforms_2D_sitk[i])
+        slice_i_nda = sitk.GetArrayViewFromImage(slice_i_sitk)
 
         # Correct intensities according to chosen model
         slice_i_nda = self._apply_intensity_correction[
@@ -1105,12 +1578,10 @@ class IntraStackRegistration(StackRegistrationBase):
             slice_i_nda, parameters[i, self._transform_type_dofs:])
 
         if self._use_stack_mask_neighbour_fit_term:
-            slice_i_sitk_mask = sitk.Resample(
+            slice_i_sitk_mask = self._resample_mask_sitk(
                 self._slices_2D[i].sitk_mask,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                sitk.sitkNearestNeighbor)
-            slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
+                self._transforms_2D_sitk[i])
+            slice_i_nda_mask = sitk.GetArrayViewFromImage(slice_i_sitk_mask)
 
         # Compute residuals for neighbouring slices
         for i in range(0, self._N_slices - 1):
@@ -1121,12 +1592,10 @@ class IntraStackRegistration(StackRegistrationBase):
             self._transforms_2D_sitk[i + 1].SetParameters(parameters_slice_ip1)
 
             # Get slice_{i+1}(T(theta_{i+1}, x))
-            slice_ip1_sitk = sitk.Resample(
+            slice_ip1_sitk = self._resample_image_sitk(
                 self._slices_2D[i + 1].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i + 1],
-                self._interpolator_sitk)
-            slice_ip1_nda = sitk.GetArrayFromImage(slice_ip1_sitk)
+                self._transforms_2D_sitk[i + 1])
+            slice_ip1_nda = sitk.GetArrayViewFromImage(slice_ip1_sitk)
 
             # Correct intensities according to chosen model
             slice_ip1_nda = self._apply_intensity_correction[
@@ -1139,23 +1608,24 @@ class IntraStackRegistration(StackRegistrationBase):
 
             # Eliminate residual for non-masked regions
             if self._use_stack_mask_neighbour_fit_term:
-                slice_ip1_sitk_mask = sitk.Resample(
+                slice_ip1_sitk_mask = self._resample_mask_sitk(
                     self._slices_2D[i + 1].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i + 1],
-                    sitk.sitkNearestNeighbor)
-                slice_ip1_nda_mask = sitk.GetArrayFromImage(
+                    self._transforms_2D_sitk[i + 1])
+                slice_ip1_nda_mask = sitk.GetArrayViewFromImage(
                     slice_ip1_sitk_mask)
 
                 residual_slice_nda = residual_slice_nda * slice_i_nda_mask * \
                     slice_ip1_nda_mask
 
+                # Keep image alive as long as its array view is used
+                slice_i_sitk_mask = slice_ip1_sitk_mask
                 slice_i_nda_mask = slice_ip1_nda_mask
 
             # Set residual for current slice difference
             residual[i, :] = residual_slice_nda.flatten()
 
             # Prepare for next iteration
+            slice_i_sitk = slice_ip1_sitk
             slice_i_nda = slice_ip1_nda
 
         return residual.flatten()
@@ -1165,6 +1635,148 @@ class IntraStackRegistration(StackRegistrationBase):
     # least_squares method.
     # \date       2016-11-21 20:08:48+0000
     #
+    # Only the blocks associated with slice_i and slice_{i+1} are non-zero for
+    # the residual of slice_i(T(theta_i, x)) - slice_{i+1}(T(theta_{i+1}, x)).
+    # Hence, the Jacobian is assembled as block bidiagonal sparse matrix. In
+    # case of linear interpolation, the Jacobians of all slices are computed
+    # in one batch. Otherwise, SimpleITK is used.
+    #
+    # \param      self            The object
+    # \param      parameters_vec  The parameters vector
+    #
+    # \return     The Jacobian residual slice neighbours fit as [(N_slices-1) *
+    #             N_slice_voxels] x [optimization_dofs * N_slices] sparse
+    #             matrix
+    #
+    def _get_jacobian_residual_slice_neighbours_fit(self, parameters_vec):
+
+        if self._interpolator not in ["Linear"]:
+            return scipy.sparse.csr_matrix(
+                self._get_jacobian_residual_slice_neighbours_fit_sitk(
+                    parameters_vec))
+
+        # Reshape parameters for easier access
+        parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+
+        # Get d[slice_i(T(theta_i, x))]/dtheta_i for all i
+        jacobian_slices = self._get_jacobian_slices_in_slice_neighbours_fit(
+            parameters)
+
+        # Blocks [d[slice_i]/dtheta_i, -d[slice_{i+1}]/dtheta_{i+1}] of each
+        # row associated with residual i
+        blocks = np.concatenate(
+            (jacobian_slices[:-1], -jacobian_slices[1:]), axis=2)
+        indices = np.arange(self._N_slices - 1)[:, np.newaxis, np.newaxis] * \
+            self._optimization_dofs + \
+            np.arange(2 * self._optimization_dofs)[np.newaxis, np.newaxis, :]
+        indices = np.broadcast_to(indices, blocks.shape)
+        indptr = np.arange(0, blocks.size + 1, 2 * self._optimization_dofs)
+
+        return scipy.sparse.csr_matrix(
+            (blocks.ravel(), indices.ravel(), indptr),
+            shape=(blocks.shape[0] * blocks.shape[1],
+                   self._N_slices * self._optimization_dofs))
+
+    ##
+    # Gets the Jacobians of all slices based on the spatial transformations.
+    # \date       2026-10-15 13:44:52+0100
+    #
+    # Batched version of \p _get_jacobian_slice_in_slice_neighbours_fit for
+    # linear interpolation. The Jacobian of the transform
+    # \f$ \frac{dT}{d\theta}(\theta, x) \f$ is affine in x for all supported
+    # transform types. Hence, it is only evaluated at three points to obtain
+    # it for all voxels of the resampling grid.
+    #
+    # \param      self        The object
+    # \param      parameters  The parameters as (N_slices x DOF)-array
+    #
+    # \return     The Jacobians of all slices as (N_slices x N_grid_voxels x
+    #             optimization_dofs)-array.
+    #
+    def _get_jacobian_slices_in_slice_neighbours_fit(self, parameters):
+
+        # Get slice_i(T(theta_i, x)) for all i
+        slices_nda, slices_nda_mask = self._get_warped_slices_2D_nda(
+            parameters)
+        slices_nda = slices_nda.reshape(self._N_slices, -1)
+
+        # Get d[slice_i(T(theta_i, x))]/dx as (N_slices x N_grid_voxels x
+        # dim)-array
+        dslices_nda = self._get_gradient_slices_2D_nda(
+            slices_nda.reshape(slices_nda_mask.shape))
+
+        # Get d[T(theta_i, x)]/dtheta_i = J_i + x * Jx_i + y * Jy_i
+        points = np.array([[0., 1., 0.], [0., 0., 1.]])
+        dT_nda = np.zeros((self._N_slices, 3, 2, self._transform_type_dofs))
+        for i in range(0, self._N_slices):
+            self._transforms_2D_itk[i].SetParameters(
+                itk.OptimizerParameters[itk.D](
+                    parameters[i, 0:self._transform_type_dofs]))
+            dT_nda[i, :, :, :] = \
+                sitkh.get_numpy_array_of_jacobian_itk_transform_applied_on_sitk_image(
+                    self._transforms_2D_itk[i],
+                    self._slice_grid_2D_sitk,
+                    points=points)
+        dT_nda[:, 1:, :, :] -= dT_nda[:, 0:1, :, :]
+
+        # Compute Jacobian w.r.t. transform parameters, i.e.
+        # sum_{k,d} dslice_i/dx_d * (1, x, y)_k * dT_i[k, d] as batched
+        # matrix product using the precomputed coordinate factors
+        dslices_points_nda = np.einsum(
+            "nvd,vk->nvkd", dslices_nda, self._slice_grid_2D_points)
+        jacobian = np.zeros(
+            (self._N_slices, slices_nda.shape[1], self._optimization_dofs))
+        jacobian[:, :, 0:self._transform_type_dofs] = np.matmul(
+            dslices_points_nda.reshape(self._N_slices, -1, 6),
+            dT_nda.reshape(self._N_slices, 6, -1))
+
+        # Add Jacobian w.r.t. to intensity correction parameters
+        if self._intensity_correction_type_slice_neighbour_fit in \
+                ["linear", "affine"]:
+            if self._use_stack_mask_neighbour_fit_term:
+                slices_nda *= slices_nda_mask.reshape(self._N_slices, -1)
+            jacobian[:, :, self._transform_type_dofs] = slices_nda
+
+        if self._intensity_correction_type_slice_neighbour_fit in \
+                ["affine"]:
+            jacobian[:, :, self._transform_type_dofs + 1] = 1
+
+        return jacobian
+
+    ##
+    # Gets the gradients of 2D slices defined on the resampling grid in
+    # physical space.
+    # \date       2026-10-15 13:58:10+0100
+    #
+    # Equivalent to the sitk.GradientImageFilter used for the SimpleITK
+    # implementation, i.e. central differences with zero-flux Neumann boundary
+    # conditions taking into account image spacing and direction.
+    #
+    # \param      self        The object
+    # \param      slices_nda  The slices as (N_slices x Ny x Nx)-array
+    #
+    # \return     The gradients as (N_slices x N_grid_voxels x dim)-array
+    #
+    def _get_gradient_slices_2D_nda(self, slices_nda):
+
+        spacing = self._slice_grid_2D_spacing
+        direction = self._slice_grid_2D_direction
+
+        padded_nda = np.pad(slices_nda, ((0, 0), (1, 1), (1, 1)), mode="edge")
+        dslices_nda = np.empty(slices_nda.shape + (2,))
+        dslices_nda[..., 0] = (padded_nda[:, 1:-1, 2:] -
+                               padded_nda[:, 1:-1, :-2]) / (2. * spacing[0])
+        dslices_nda[..., 1] = (padded_nda[:, 2:, 1:-1] -
+                               padded_nda[:, :-2, 1:-1]) / (2. * spacing[1])
+
+        return dslices_nda.reshape(
+            self._N_slices, -1, 2).dot(direction.transpose())
+
+    ##
+    # Gets the Jacobian to \p _get_residual_slice_neighbours_fit based on
+    # SimpleITK resampling.
+    # \date       2016-11-21 20:08:48+0000
+    #
     # \param      self            The object
     # \param      parameters_vec  The parameters vector
     #
@@ -1172,7 +1784,7 @@ class IntraStackRegistration(StackRegistrationBase):
     #             N_slice_voxels] x [transform_type_dofs * N_slices] numpy
     #             array
     #
-    def _get_jacobian_residual_slice_neighbours_fit(self, parameters_vec):
+    def _get_jacobian_residual_slice_neighbours_fit_sitk(self, parameters_vec):
 
         # Allocate memory for Jacobian of residual
         jacobian = np.zeros((
@@ -1250,11 +1862,9 @@ class IntraStackRegistration(StackRegistrationBase):
                                                     transform_itk):
 
         # Get slice(T(theta, x))
-        slice_sitk = sitk.Resample(
+        slice_sitk = self._resample_image_sitk(
             slice.sitk,
-            self._slice_grid_2D_sitk,
-            transform_sitk,
-            self._interpolator_sitk)
+            transform_sitk)
 
         # Get d[slice(T(theta, x))]/dx as (Ny x Nx x dim)-array
         dslice_nda = self._get_gradient_image_nda_from_sitk_image(slice_sitk)
@@ -1264,12 +1874,10 @@ class IntraStackRegistration(StackRegistrationBase):
         slice_nda = sitk.GetArrayFromImage(slice_sitk)
 
         if self._use_stack_mask_neighbour_fit_term:
-            slice_sitk_mask = sitk.Resample(
+            slice_sitk_mask = self._resample_mask_sitk(
                 slice.sitk_mask,
-                self._slice_grid_2D_sitk,
-                transform_sitk,
-                sitk.sitkNearestNeighbor)
-            slice_nda_mask = sitk.GetArrayFromImage(slice_sitk_mask)
+                transform_sitk)
+            slice_nda_mask = sitk.GetArrayViewFromImage(slice_sitk_mask)
 
             # slice_nda *= slice_nda_mask[:,:,np.newaxis]
             slice_nda *= slice_nda_mask
@@ -1574,9 +2182,10 @@ class IntraStackRegistration(StackRegistrationBase):
             self._dictionary_transform_initializer_type_sitk[
                 self._transform_initializer_type]
 
-        # Create list of identity transforms
-        transforms_2D_sitk = [self._new_transform_sitk[
-            self._transform_type]()] * self._N_slices
+        # Create list of identity transforms (one object per slice)
+        transforms_2D_sitk = [
+            self._new_transform_sitk[self._transform_type]()
+            for i in range(0, self._N_slices)]
 
         # Get list of identity transform parameters for all slices
         parameters = np.zeros((self._N_slices, self._transform_type_dofs))
@@ -1592,26 +2201,24 @@ class IntraStackRegistration(StackRegistrationBase):
             compensation_transform_sitk = self._new_transform_sitk[
                 self._transform_type]()
 
+            if self._use_stack_mask_neighbour_fit_term:
+                slices_2D_sitk = self._get_masked_slices_2D_sitk(
+                    self._slices_2D)
+            else:
+                slices_2D_sitk = [s.sitk for s in self._slices_2D]
+
             # First slice is kept at position and others are aligned
             # accordingly
             for i in range(1, self._N_slices):
 
                 # Take into account the initialization of slice i-1
-                slice_im1_sitk = sitk.Image(self._slices_2D[i - 1].sitk)
-                if self._use_stack_mask_neighbour_fit_term:
-                    slice_im1_sitk *= sitk.Cast(
-                        self._slices_2D[i - 1].sitk_mask,
-                        slice_im1_sitk.GetPixelIDValue())
                 slice_im1_sitk = sitkh.get_transformed_sitk_image(
-                    slice_im1_sitk, compensation_transform_sitk)
+                    slices_2D_sitk[i - 1], compensation_transform_sitk)
 
                 # Use sitk.CenteredTransformInitializerFilter to get initial
                 # transform
                 fixed_sitk = slice_im1_sitk
-                moving_sitk = sitk.Image(self._slices_2D[i].sitk)
-                if self._use_stack_mask_neighbour_fit_term:
-                    moving_sitk *= sitk.Cast(self._slices_2D[i].sitk_mask,
-                                             moving_sitk.GetPixelIDValue())
+                moving_sitk = slices_2D_sitk[i]
                 initial_transform_sitk = self._new_transform_sitk[
                     self._transform_type]()
                 operation_mode_sitk = eval(
@@ -1649,22 +2256,28 @@ class IntraStackRegistration(StackRegistrationBase):
         # Initialize transform to match each slice with the reference
         else:
 
+            if self._use_reference_mask:
+                fixed_slices_2D_sitk = self._get_masked_slices_2D_sitk(
+                    self._init_slices_2D_reference)
+            else:
+                fixed_slices_2D_sitk = [
+                    s.sitk for s in self._init_slices_2D_reference]
+
+            if self._use_stack_mask_reference_fit_term:
+                moving_slices_2D_sitk = self._get_masked_slices_2D_sitk(
+                    self._init_slices_2D_stack_reference_term)
+            else:
+                moving_slices_2D_sitk = [
+                    s.sitk for s in self._init_slices_2D_stack_reference_term]
+
             # print self._use_reference_mask
             # print self._use_stack_mask_reference_fit_term
             for i in range(0, self._N_slices):
 
                 # Use sitk.CenteredTransformInitializerFilter to get initial
                 # transform
-                fixed_sitk = self._init_slices_2D_reference[i].sitk
-                if self._use_reference_mask:
-                    fixed_sitk *= sitk.Cast(
-                        self._init_slices_2D_reference[i].sitk_mask,
-                        fixed_sitk.GetPixelIDValue())
-                moving_sitk = self._init_slices_2D_stack_reference_term[i].sitk
-                if self._use_stack_mask_reference_fit_term:
-                    moving_sitk *= sitk.Cast(
-                        self._init_slices_2D_stack_reference_term[i].sitk_mask,
-                        moving_sitk.GetPixelIDValue())
+                fixed_sitk = fixed_slices_2D_sitk[i]
+                moving_sitk = moving_slices_2D_sitk[i]
                 initial_transform_sitk = self._new_transform_sitk[
                     self._transform_type]()
                 operation_mode_sitk = eval(
@@ -1692,6 +2305,32 @@ class IntraStackRegistration(StackRegistrationBase):
 
         return transforms_2D_sitk, parameters
 
+    ##
+    # Gets the 2D slices multiplied by their masks.
+    # \date       2026-10-15 15:40:26+0100
+    #
+    # Masking is performed on the stacked data arrays of all slices at once.
+    #
+    # \param      self       The object
+    # \param      slices_2D  List of 2D slices as Slice objects
+    #
+    # \return     List of masked 2D slices as sitk.Image objects
+    #
+    def _get_masked_slices_2D_sitk(self, slices_2D):
+
+        slices_nda = np.array(
+            [sitk.GetArrayViewFromImage(s.sitk) for s in slices_2D])
+        slices_nda_mask = np.array(
+            [sitk.GetArrayViewFromImage(s.sitk_mask) for s in slices_2D])
+        np.multiply(slices_nda, slices_nda_mask, out=slices_nda)
+
+        slices_2D_sitk = [None] * len(slices_2D)
+        for i in range(0, len(slices_2D)):
+            slices_2D_sitk[i] = sitk.GetImageFromArray(slices_nda[i])
+            slices_2D_sitk[i].CopyInformation(slices_2D[i].sitk)
+
+        return slices_2D_sitk
+
     ##
     # Gets the initial intensity correction parameters.
     # \date       2016-11-10 02:38:17+0000
@@ -1710,9 +2349,9 @@ class IntraStackRegistration(StackRegistrationBase):
         # affine intensity correction type requires additional column (but set
         # to zero)
         elif self._intensity_correction_type_slice_neighbour_fit in ["affine"]:
-            return np.concatenate((np.ones((self._N_slices, 1)),
-                                   np.zeros((self._N_slices, 1))),
-                                  axis=1)
+            parameters = np.zeros((self._N_slices, 2))
+            parameters[:, 0] = 1
+            return parameters
 
     def _get_initial_intensity_correction_parameters_linear(self):
 
@@ -1735,10 +2374,9 @@ class IntraStackRegistration(StackRegistrationBase):
             # affine intensity correction type requires additional column (but
             # set to zero)
             if self._intensity_correction_type_slice_neighbour_fit in ["affine"]:
-                intensity_corrections_coefficients = np.concatenate(
-                    (intensity_corrections_coefficients,
-                        np.zeros((self._N_slices, 1))),
-                    axis=1)
+                coefficients = np.zeros((self._N_slices, 2))
+                coefficients[:, 0:1] = intensity_corrections_coefficients
+                intensity_corrections_coefficients = coefficients
 
         return intensity_corrections_coefficients
 
@@ -1852,35 +2490,31 @@ class IntraStackRegistration(StackRegistrationBase):
                                           registration_image_type="identity"):
 
         slices_3D = stack.get_slices()
-        slices_2D = [None] * self._N_slices
 
-        if registration_image_type in ["partial_derivative"]:
-            dy_slices_2D = [None] * self._N_slices
+        # Get transform to get axis aligned slice of original stack
+        T_PP = self._get_TPP_matrix_nda(slices_3D[0].sitk)
 
-        for i in range(0, self._N_slices):
+        # Align all slices with physical coordinate system (perhaps already
+        # shifted there), i.e. compute origins and directions of
+        # T_PP o T_PI for all slices at once
+        origins_3D = np.array([s.sitk.GetOrigin() for s in slices_3D])
+        directions_3D = np.array(
+            [s.sitk.GetDirection() for s in slices_3D]).reshape(-1, 3, 3)
+        origins_3D_align = origins_3D.dot(T_PP[0:3, 0:3].transpose()) + \
+            T_PP[0:3, 3]
+        directions_3D_align = np.einsum(
+            "ij,njk->nik", T_PP[0:3, 0:3], directions_3D).reshape(-1, 9)
+
+        # Project the i-th slice to 2D. Only filters local to the call are
+        # used so that the slices can be processed concurrently
+        def _process_slice(i):
 
             # Create copy of the slices (since its header will be updated)
             slice_3D = sl.Slice.from_slice(slices_3D[i])
 
-            # Get transform to get axis aligned slice of original stack
-            # T_PP = self._get_TPP_transform(slice_3D.sitk)
-            T_PP = self._get_TPP_transform(slices_3D[0].sitk)
-
-            # Get current transform from image to physical space of slice
-            T_PI = sitkh.get_sitk_affine_transform_from_sitk_image(
-                slice_3D.sitk)
-
-            # Get transform to align slice with physical coordinate system
-            # (perhaps already shifted there)
-            T_PI_align = sitkh.get_composite_sitk_affine_transform(T_PP, T_PI)
-
             # Set direction and origin of image accordingly
-            origin_3D_sitk = \
-                sitkh.get_sitk_image_origin_from_sitk_affine_transform(
-                    T_PI_align, slice_3D.sitk)
-            direction_3D_sitk = \
-                sitkh.get_sitk_image_direction_from_sitk_affine_transform(
-                    T_PI_align, slice_3D.sitk)
+            origin_3D_sitk = origins_3D_align[i]
+            direction_3D_sitk = directions_3D_align[i]
 
             slice_3D.sitk.SetDirection(direction_3D_sitk)
             slice_3D.sitk.SetOrigin(origin_3D_sitk)
@@ -1896,34 +2530,42 @@ class IntraStackRegistration(StackRegistrationBase):
 
             if registration_image_type in ["identity"]:
 
-                slices_2D[i] = sl.Slice.from_sitk_image(
+                slice_2D = sl.Slice.from_sitk_image(
                     slice_sitk=slice_2D_sitk,
                     filename=filename,
                     slice_number=slice_number,
                     slice_sitk_mask=slice_2D_sitk_mask,
                     slice_thickness=slice_3D.get_slice_thickness(),
                 )
+                return slice_2D, None
 
             elif registration_image_type in ["gradient_magnitude"]:
                 # print("Gradient magnitude of image")
-                gradient_magnitude_slice_2D_sitk = \
-                    self._gradient_magnitude_filter_sitk.Execute(slice_2D_sitk)
+                gradient_magnitude_slice_2D_sitk = sitk.GradientMagnitude(
+                    slice_2D_sitk, useImageSpacing=True)
 
-                slices_2D[i] = sl.Slice.from_sitk_image(
+                slice_2D = sl.Slice.from_sitk_image(
                     slice_sitk=gradient_magnitude_slice_2D_sitk,
                     filename="GradMagn_" + filename,
                     slice_number=slice_number,
                     slice_sitk_mask=slice_2D_sitk_mask,
                     slice_thickness=slice_3D.get_slice_thickness(),
                 )
+                return slice_2D, None
 
             elif registration_image_type in ["partial_derivative"]:
                 # print("Partial derivatives of image")
 
-                dx_slice_2D_sitk = self._get_dx_image_sitk(slice_2D_sitk)
-                dy_slice_2D_sitk = self._get_dy_image_sitk(slice_2D_sitk)
+                dslice_2D_sitk = sitk.Gradient(
+                    slice_2D_sitk,
+                    useImageSpacing=True,
+                    useImageDirection=True)
+                dx_slice_2D_sitk = sitk.VectorIndexSelectionCast(
+                    dslice_2D_sitk, 0)
+                dy_slice_2D_sitk = sitk.VectorIndexSelectionCast(
+                    dslice_2D_sitk, 1)
 
-                slices_2D[i] = sl.Slice.from_sitk_image(
+                dx_slice_2D = sl.Slice.from_sitk_image(
                     slice_sitk=dx_slice_2D_sitk,
                     dir_input=None,
                     filename="dx_" + filename,
@@ -1931,7 +2573,7 @@ class IntraStackRegistration(StackRegistrationBase):
                     slice_sitk_mask=slice_2D_sitk_mask,
                     slice_thickness=slice_3D.get_slice_thickness(),
                 )
-                dy_slices_2D[i] = sl.Slice.from_sitk_image(
+                dy_slice_2D = sl.Slice.from_sitk_image(
                     slice_sitk=dy_slice_2D_sitk,
                     dir_input=None,
                     filename="dy_" + filename,
@@ -1939,16 +2581,74 @@ class IntraStackRegistration(StackRegistrationBase):
                     slice_sitk_mask=slice_2D_sitk_mask,
                     slice_thickness=slice_3D.get_slice_thickness(),
                 )
+                return dx_slice_2D, dy_slice_2D
 
-                # Debug
-                # sitkh.show_sitk_image([slice_3D.sitk[:,:,0],slice_2D_sitk], title=["standard_slice"+str(i), "gradient_magnitude_slice"+str(i)])
-                # ph.pause()
-                # ph.killall_itksnap()
+        slices_2D, dy_slices_2D = zip(*self._map_over_slices(_process_slice))
 
         if registration_image_type in ["partial_derivative"]:
-            return slices_2D, dy_slices_2D
+            return list(slices_2D), list(dy_slices_2D)
         else:
-            return slices_2D
+            return list(slices_2D)
+
+    ##
+    # Apply a function independently to all slice indices, i.e. compute
+    # [function(0), ..., function(N_slices-1)].
+    # \date       2026-10-15 16:10:23+0100
+    #
+    # The slices are processed by a thread pool unless only one thread is
+    # set (see set_n_threads), in which case they are processed serially.
+    # Threads suffice since the heavy work is done by SimpleITK, which
+    # releases the GIL.
+    #
+    # \param      self      The object
+    # \param      function  Function taking the slice index as single argument
+    #
+    # \return     List of function results in the order of the slices.
+    #
+    def _map_over_slices(self, function):
+        if self._n_threads == 1:
+            return [function(i) for i in range(0, self._N_slices)]
+
+        with ThreadPoolExecutor(max_workers=self._n_threads) as executor:
+            return list(executor.map(function, range(0, self._N_slices)))
+
+    ##
+    # Gets a resample filter which resamples images on the 2D slice grid,
+    # i.e. the fixed image space during registration.
+    # \date       2026-10-15 17:41:26+0100
+    #
+    # The filter is set up once so that only the transform needs to be
+    # updated for each resampling in the residual and Jacobian evaluations.
+    #
+    # \param      self          The object
+    # \param      interpolator  The sitk interpolator
+    #
+    # \return     The sitk.ResampleImageFilter object.
+    #
+    def _get_resampler_sitk(self, interpolator):
+        resampler_sitk = sitk.ResampleImageFilter()
+        resampler_sitk.SetReferenceImage(self._slice_grid_2D_sitk)
+        resampler_sitk.SetInterpolator(interpolator)
+        return resampler_sitk
+
+    ##
+    # Resample an image (mask) on the 2D slice grid according to the given
+    # transform using the chosen interpolator (nearest neighbour).
+    # \date       2026-10-15 17:43:02+0100
+    #
+    # \param      self            The object
+    # \param      image_sitk      The image sitk
+    # \param      transform_sitk  The transform sitk
+    #
+    # \return     The resampled image as sitk.Image object.
+    #
+    def _resample_image_sitk(self, image_sitk, transform_sitk):
+        self._resampler_sitk.SetTransform(transform_sitk)
+        return self._resampler_sitk.Execute(image_sitk)
+
+    def _resample_mask_sitk(self, image_sitk_mask, transform_sitk):
+        self._resampler_mask_sitk.SetTransform(transform_sitk)
+        return self._resampler_mask_sitk.Execute(image_sitk_mask)
 
     ##
     # Get the 3D rigid transforms to arrive at the positions of original 3D
@@ -1957,26 +2657,89 @@ class IntraStackRegistration(StackRegistrationBase):
     # \date       2016-09-20 23:37:05+0100
     #
     # The rigid transform is given as composed translation and rotation
-    # transform, i.e. T_PP = (T_t \c irc T_rot)^{-1}.
-    #
-    # \param      self  The object
+    # transform, i.e. T_PP = (T_t \c irc T_rot)^{-1}. Since the direction
+    # matrix R is orthonormal, the inverse is given analytically by
+    # x -> R^T (x - origin).
     #
-    # \return     List of 3D rigid transforms (sitk.AffineTransform(3) objects)
-    #             to arrive at the positions of the original 3D slices.
+    # \param      self        The object
+    # \param      slice_sitk  The slice as sitk.Image object
     #
-    # TODO: Change to make simpler
+    # \return     T_PP as homogeneous (4 x 4)-array.
     #
-    def _get_TPP_transform(self, slice_sitk):
+    def _get_TPP_matrix_nda(self, slice_sitk):
 
-        origin_3D_sitk = np.array(slice_sitk.GetOrigin())
-        direction_3D_sitk = np.array(slice_sitk.GetDirection())
-        T_PP = sitk.AffineTransform(3)
-        T_PP.SetMatrix(direction_3D_sitk)
-        T_PP.SetTranslation(origin_3D_sitk)
-        T_PP = sitk.AffineTransform(T_PP.GetInverse())
+        origin_3D = np.array(slice_sitk.GetOrigin())
+        direction_3D = np.array(slice_sitk.GetDirection()).reshape(3, 3)
+
+        T_PP = np.eye(4)
+        T_PP[0:3, 0:3] = direction_3D.transpose()
+        T_PP[0:3, 3] = -direction_3D.transpose().dot(origin_3D)
 
         return T_PP
 
+    ##
+    # Compose the 3D transforms in the physically aligned space to the
+    # in-plane transforms T_PP^{-1} o T_3D o T_PP of the slices.
+    # \date       2026-10-15 17:20:36+0100
+    #
+    # \param      self                The object
+    # \param      transforms_3D_nda  (N_slices x 4 x 4)-array of homogeneous
+    #                                 matrices of the 3D transforms
+    #
+    # \return     (N_slices x 4 x 4)-array of homogeneous matrices of the
+    #             in-plane transforms.
+    #
+    def _get_in_plane_transforms_nda(self, transforms_3D_nda):
+
+        # Get transform to get axis aligned slice and its inverse
+        T_PP = self._get_TPP_matrix_nda(self._stack.get_slices()[0].sitk)
+        T_PP_inv = np.eye(4)
+        T_PP_inv[0:3, 0:3] = T_PP[0:3, 0:3].transpose()
+        T_PP_inv[0:3, 3] = -T_PP_inv[0:3, 0:3].dot(T_PP[0:3, 3])
+
+        return np.einsum("ij,njk,kl->nil",
+                         T_PP_inv, transforms_3D_nda, T_PP)
+
+    ##
+    # Gets the homogeneous matrix of an affine sitk transform, i.e. the
+    # (dim+1 x dim+1)-array representing x -> A(x-c) + t + c.
+    # \date       2026-10-15 17:12:54+0100
+    #
+    # \param      transform_sitk  The transform sitk
+    #
+    # \return     The homogeneous matrix as numpy array.
+    #
+    @staticmethod
+    def _get_homogeneous_matrix_from_sitk_transform(transform_sitk):
+        dim = transform_sitk.GetDimension()
+        A = np.array(transform_sitk.GetMatrix()).reshape(dim, dim)
+        c = np.array(transform_sitk.GetCenter())
+        t = np.array(transform_sitk.GetTranslation())
+
+        matrix = np.eye(dim + 1)
+        matrix[0:dim, 0:dim] = A
+        matrix[0:dim, dim] = t + c - A.dot(c)
+
+        return matrix
+
+    ##
+    # Gets the sitk.AffineTransform (with zero center) associated with a
+    # homogeneous matrix.
+    # \date       2026-10-15 17:13:40+0100
+    #
+    # \param      matrix  The homogeneous matrix as numpy array
+    #
+    # \return     The sitk.AffineTransform object.
+    #
+    @staticmethod
+    def _get_sitk_affine_transform_from_homogeneous_matrix(matrix):
+        dim = matrix.shape[0] - 1
+        transform_sitk = sitk.AffineTransform(dim)
+        transform_sitk.SetMatrix(matrix[0:dim, 0:dim].flatten())
+        transform_sitk.SetTranslation(matrix[0:dim, dim])
+
+        return transform_sitk
+
     """
     Transform specific parts from here
     """
@@ -1999,6 +2762,28 @@ class IntraStackRegistration(StackRegistrationBase):
     def _new_affine_transform_itk(self):
         return itk.AffineTransform.D2.New()
 
+    ##
+    # Gets the matrices of the 2D transforms of all slices given their
+    # parameters, i.e. without updating the sitk.Transform objects.
+    # \date       2026-10-15 15:06:41+0100
+    #
+    # \param      self        The object
+    # \param      parameters  The parameters as (N_slices x DOF)-array
+    #
+    # \return     The matrices as (N_slices x 2 x 2)-array
+    #
+    def _get_rigid_transforms_2D_matrices_nda(self, parameters):
+        cos = np.cos(parameters[:, 0])
+        sin = np.sin(parameters[:, 0])
+        return np.stack((cos, -sin, sin, cos), axis=1).reshape(-1, 2, 2)
+
+    def _get_similarity_transforms_2D_matrices_nda(self, parameters):
+        return parameters[:, 0, np.newaxis, np.newaxis] * \
+            self._get_rigid_transforms_2D_matrices_nda(parameters[:, 1:])
+
+    def _get_affine_transforms_2D_matrices_nda(self, parameters):
+        return parameters[:, 0:4].reshape(-1, 2, 2)
+
     ##
     # Perform motion correction based on performed registration to get motion
     # corrected stack and associated slice transforms.
@@ -2025,42 +2810,36 @@ class IntraStackRegistration(StackRegistrationBase):
         stack_corrected = st.Stack.from_stack(self._stack)
         slices_corrected = stack_corrected.get_slices()
 
-        slices = self._stack.get_slices()
+        # Invert registration transforms to physically move the slices, i.e.
+        # angle -theta and translation -R^T t about the same center
+        parameters = self._parameters[:, 0:self._transform_type_dofs]
+        R = self._get_rigid_transforms_2D_matrices_nda(parameters)
+        parameters_inv = np.empty_like(parameters)
+        parameters_inv[:, 0] = -parameters[:, 0]
+        parameters_inv[:, 1:] = -np.einsum("nji,nj->ni", R, parameters[:, 1:])
 
-        slice_transforms_sitk = [None] * self._N_slices
+        # Expand to 3D transforms
+        transforms_3D_nda = self._get_3D_from_2D_rigid_transforms_batch(
+            parameters_inv, self._transforms_2D_center)
 
-        for i in range(0, self._N_slices):
+        # Compose to 3D in-plane transforms
+        affine_transforms_nda = self._get_in_plane_transforms_nda(
+            transforms_3D_nda)
 
-            # Set transform for the 2D slice based on registration transform
-            self._transforms_2D_sitk[i].SetParameters(
-                self._parameters[i, 0:self._transform_type_dofs])
+        def _process_slice(i):
 
-            # Invert it to physically move the slice
-            transform_2D_sitk = sitk.Euler2DTransform(
-                self._transforms_2D_sitk[i].GetInverse())
-
-            # Expand to 3D transform
-            transform_3D_sitk = self._get_3D_from_2D_rigid_transform_sitk(
-                transform_2D_sitk)
-
-            # Get transform to get axis aligned slice
-            # T_PP = self._get_TPP_transform(slices[i].sitk)
-            T_PP = self._get_TPP_transform(slices[0].sitk)
-
-            # Compose to 3D in-plane transform
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                transform_3D_sitk, T_PP)
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                sitk.AffineTransform(T_PP.GetInverse()), affine_transform_sitk)
+            affine_transform_sitk = \
+                self._get_sitk_affine_transform_from_homogeneous_matrix(
+                    affine_transforms_nda[i])
 
             # Update motion correction of slice
             slices_corrected[i].update_motion_correction(affine_transform_sitk)
 
             # Keep slice transform
-            slice_transforms_sitk[i] = affine_transform_sitk
+            return affine_transform_sitk
 
         self._stack_corrected = stack_corrected
-        self._slice_transforms_sitk = slice_transforms_sitk
+        self._slice_transforms_sitk = self._map_over_slices(_process_slice)
 
     ##
     # Apply motion correction after similarity registration
@@ -2078,54 +2857,53 @@ class IntraStackRegistration(StackRegistrationBase):
 
         slices = self._stack.get_slices()
 
-        slice_transforms_sitk = [None] * self._N_slices
-
-        for i in range(0, self._N_slices):
-
-            # Set transform for the 2D slice based on registration transform
-            self._transforms_2D_sitk[i].SetParameters(
-                self._parameters[i, 0:self._transform_type_dofs])
-
-            # Invert it to physically move the slice
-            similarity_2D_sitk = sitk.Similarity2DTransform(
-                self._transforms_2D_sitk[i].GetInverse())
-
-            # Convert to 2D rigid registration transform
-            scale = similarity_2D_sitk.GetScale()
-            origin = np.array(self._slices_2D[i].sitk.GetOrigin())
-            center = np.array(similarity_2D_sitk.GetCenter())
-            angle = similarity_2D_sitk.GetAngle()
-            translation = np.array(similarity_2D_sitk.GetTranslation())
-            R = np.array(similarity_2D_sitk.GetMatrix()).reshape(2, 2) / scale
-
-            # if self._use_verbose:
-            #     print("Slice %2d/%d: in-plane scaling factor = %.3f" %(i, self._N_slices-1, 1/scale))
-
-            rigid_2D_sitk = sitk.Euler2DTransform()
-            rigid_2D_sitk.SetAngle(angle)
-            rigid_2D_sitk.SetTranslation(
-                scale * R.dot(origin - center) - R.dot(origin) + translation + center)
-
-            # Expand to 3D rigid transform
-            rigid_3D_sitk = self._get_3D_from_2D_rigid_transform_sitk(
-                rigid_2D_sitk)
-
-            # Get transform to get axis aligned slice
-            # T_PP = self._get_TPP_transform(slices[i].sitk)
-            T_PP = self._get_TPP_transform(slices[0].sitk)
-
-            # Compose to 3D in-plane transform
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                rigid_3D_sitk, T_PP)
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                sitk.AffineTransform(T_PP.GetInverse()), affine_transform_sitk)
+        # Invert registration transforms to physically move the slices, i.e.
+        # scale 1/s, angle -theta and translation -1/s R^T t about the same
+        # center
+        parameters = self._parameters[:, 0:self._transform_type_dofs]
+        scales = 1. / parameters[:, 0]
+        R = np.transpose(self._get_rigid_transforms_2D_matrices_nda(
+            parameters[:, 1:]), (0, 2, 1))
+        translations = -scales[:, np.newaxis] * \
+            np.einsum("nij,nj->ni", R, parameters[:, 2:])
+
+        # Convert to 2D rigid transforms (with zero center) which keep the
+        # slice origins at the position of the scaled slices
+        origins = np.array([s.sitk.GetOrigin() for s in self._slices_2D])
+        centers = self._transforms_2D_center
+        parameters_rigid = np.empty((self._N_slices, 3))
+        parameters_rigid[:, 0] = -parameters[:, 1]
+        parameters_rigid[:, 1:] = \
+            scales[:, np.newaxis] * \
+            np.einsum("nij,nj->ni", R, origins - centers) - \
+            np.einsum("nij,nj->ni", R, origins) + translations + centers
+
+        # Expand to 3D rigid transforms and to affine transforms including
+        # the scaling information
+        rigid_transforms_3D_nda = self._get_3D_from_2D_rigid_transforms_batch(
+            parameters_rigid, np.zeros((self._N_slices, 2)))
+        affine_transforms_3D_nda = np.array(rigid_transforms_3D_nda)
+        affine_transforms_3D_nda[:, 0:2, 0:2] *= \
+            scales[:, np.newaxis, np.newaxis]
+
+        # Compose to 3D in-plane transforms
+        rigid_transforms_nda = self._get_in_plane_transforms_nda(
+            rigid_transforms_3D_nda)
+        affine_transforms_nda = self._get_in_plane_transforms_nda(
+            affine_transforms_3D_nda)
+
+        def _process_slice(i):
+
+            affine_transform_sitk = \
+                self._get_sitk_affine_transform_from_homogeneous_matrix(
+                    rigid_transforms_nda[i])
 
             # Update motion correction of slice
             slices_corrected[i].update_motion_correction(affine_transform_sitk)
 
             # Update spacing of slice accordingly
             spacing = np.array(slices[i].sitk.GetSpacing())
-            spacing[0:-1] *= scale
+            spacing[0:-1] *= scales[i]
 
             slices_corrected[i].sitk.SetSpacing(spacing)
             slices_corrected[i].sitk_mask.SetSpacing(spacing)
@@ -2134,25 +2912,12 @@ class IntraStackRegistration(StackRegistrationBase):
             slices_corrected[i].itk_mask = \
                 sitkh.get_itk_from_sitk_image(slices_corrected[i].sitk_mask)
 
-            # Update affine transform (including scaling information)
-            affine_3D_sitk = sitk.AffineTransform(3)
-            affine_matrix_sitk = np.array(
-                rigid_3D_sitk.GetMatrix()).reshape(3, 3)
-            affine_matrix_sitk[0:-1, 0:-1] *= scale
-            affine_3D_sitk.SetMatrix(affine_matrix_sitk.flatten())
-            affine_3D_sitk.SetCenter(rigid_3D_sitk.GetCenter())
-            affine_3D_sitk.SetTranslation(rigid_3D_sitk.GetTranslation())
-
-            affine_3D_sitk = sitkh.get_composite_sitk_affine_transform(
-                affine_3D_sitk, T_PP)
-            affine_3D_sitk = sitkh.get_composite_sitk_affine_transform(
-                sitk.AffineTransform(T_PP.GetInverse()), affine_3D_sitk)
-
             # Keep affine slice transform
-            slice_transforms_sitk[i] = affine_3D_sitk
+            return self._get_sitk_affine_transform_from_homogeneous_matrix(
+                affine_transforms_nda[i])
 
         self._stack_corrected = stack_corrected
-        self._slice_transforms_sitk = slice_transforms_sitk
+        self._slice_transforms_sitk = self._map_over_slices(_process_slice)
 
     ##
     # Apply motion correction after affine registration
@@ -2167,9 +2932,7 @@ class IntraStackRegistration(StackRegistrationBase):
         stack_corrected = st.Stack.from_stack(self._stack)
         slices_corrected = stack_corrected.get_slices()
 
-        slices = self._stack.get_slices()
-
-        slice_transforms_sitk = [None] * self._N_slices
+        transforms_3D_nda = np.zeros((self._N_slices, 4, 4))
 
         for i in range(0, self._N_slices):
 
@@ -2182,61 +2945,66 @@ class IntraStackRegistration(StackRegistrationBase):
                 self._transforms_2D_sitk[i].GetInverse())
 
             # Expand to 3D transform
-            transform_3D_sitk = self._get_3D_from_2D_affine_transform_sitk(
-                transform_2D_sitk)
+            transforms_3D_nda[i] = \
+                self._get_homogeneous_matrix_from_sitk_transform(
+                    self._get_3D_from_2D_affine_transform_sitk(transform_2D_sitk))
 
-            # Get transform to get axis aligned slice
-            # T_PP = self._get_TPP_transform(slices[i].sitk)
-            T_PP = self._get_TPP_transform(slices[0].sitk)
+        # Compose to 3D in-plane transforms
+        affine_transforms_nda = self._get_in_plane_transforms_nda(
+            transforms_3D_nda)
 
-            # Compose to 3D in-plane transform
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                transform_3D_sitk, T_PP)
-            affine_transform_sitk = sitkh.get_composite_sitk_affine_transform(
-                sitk.AffineTransform(T_PP.GetInverse()), affine_transform_sitk)
+        def _process_slice(i):
+
+            affine_transform_sitk = \
+                self._get_sitk_affine_transform_from_homogeneous_matrix(
+                    affine_transforms_nda[i])
 
             # Update motion correction of slice
             slices_corrected[i].update_motion_correction(affine_transform_sitk)
 
             # Keep slice transform
-            slice_transforms_sitk[i] = affine_transform_sitk
+            return affine_transform_sitk
 
         self._stack_corrected = stack_corrected
-        self._slice_transforms_sitk = slice_transforms_sitk
+        self._slice_transforms_sitk = self._map_over_slices(_process_slice)
 
     ##
-    # Create 3D from 2D transform.
-    # \date       2016-09-20 23:18:55+0100
-    #
-    # The generated 3D transform performs in-plane operations in case the
-    # physical coordinate system is aligned with the axis of the stack/slice
-    #
-    # \param      self                     The object
-    # \param      rigid_transform_2D_sitk  sitk.Euler2DTransform object
-    #
-    # \return     sitk.Euler3DTransform object.
-    #
-    def _get_3D_from_2D_rigid_transform_sitk(self, rigid_transform_2D_sitk):
-
-        # Get parameters of 2D registration
-        angle_z, translation_x, translation_y = \
-            rigid_transform_2D_sitk.GetParameters()
-        center_x, center_y = rigid_transform_2D_sitk.GetCenter()
-
-        # Expand obtained translation to 3D vector
-        translation_3D = (translation_x, translation_y, 0)
-        center_3D = (center_x, center_y, 0)
-
-        # Create 3D rigid transform based on 2D
-        rigid_transform_3D = sitk.Euler3DTransform()
-        rigid_transform_3D.SetRotation(0, 0, angle_z)
-        rigid_transform_3D.SetTranslation(translation_3D)
-
-        # Append zero for m_ComputeZYX = 0 (part of fixed params in SimpleITK
-        # 1.0.0)
-        rigid_transform_3D.SetFixedParameters(center_3D + (0.,))
-
-        return rigid_transform_3D
+    # Create 3D from 2D rigid transforms for all slices at once.
+    # \date       2026-10-15 19:02:27+0100
+    #
+    # The generated 3D transforms perform in-plane operations in case the
+    # physical coordinate system is aligned with the axis of the stack/slice,
+    # i.e. they correspond to sitk.Euler3DTransform objects with rotation
+    # (0, 0, angle) and translation (tx, ty, 0) about the center (cx, cy, 0).
+    #
+    # \param      self        The object
+    # \param      params_2d   Parameters (angle, tx, ty) of the
+    #                         sitk.Euler2DTransform objects as (N_slices x 3)
+    #                         numpy array
+    # \param      centers_2d  Centers (cx, cy) of the sitk.Euler2DTransform
+    #                         objects as (N_slices x 2) numpy array
+    #
+    # \return     Homogeneous matrices of the 3D transforms as (N_slices x 4 x
+    #             4) numpy array
+    #
+    def _get_3D_from_2D_rigid_transforms_batch(self, params_2d, centers_2d):
+
+        cos = np.cos(params_2d[:, 0])
+        sin = np.sin(params_2d[:, 0])
+
+        matrices = np.zeros((params_2d.shape[0], 4, 4))
+        matrices[:, 0, 0] = cos
+        matrices[:, 0, 1] = -sin
+        matrices[:, 1, 0] = sin
+        matrices[:, 1, 1] = cos
+        matrices[:, 2, 2] = 1
+        matrices[:, 3, 3] = 1
+
+        # Offset t + c - R c
+        matrices[:, 0:2, 3] = params_2d[:, 1:3] + centers_2d - np.einsum(
+            "nij,nj->ni", matrices[:, 0:2, 0:2], centers_2d)
+
+        return matrices
 
     ##
     # Create 3D from 2D transform.
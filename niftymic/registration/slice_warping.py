@@ -0,0 +1,220 @@
+##
+# \file slice_warping.py
+# \brief      Compiled kernels to warp a stack of 2D slices and to compute the
+#             residuals between neighbouring slices as used for intra-stack
+#             registration.
+#
+# The kernels rely on numba, which is listed in requirements.txt. In case
+# numba cannot be imported nonetheless, USE_NUMBA is False and the caller
+# silently falls back to its numpy-based implementation. The results are
+# the same, but the residual and Jacobian evaluations of the intra-stack
+# registration are then considerably slower.
+#
+# \date       Oct 2026
+#
+
+
+# Import libraries
+import math
+import numpy as np
+
+# Flag whether the compiled kernels are available; see above for the
+# fallback if numba is missing
+try:
+    import numba
+    USE_NUMBA = True
+except ImportError:
+    USE_NUMBA = False
+
+
+##
+# Edge length of the square tiles of the resampling grid processed by the
+# fused warp and residual kernel. A pair of neighbouring (warped slice, mask)
+# tiles then occupies about 10 kB and remains in L1 cache.
+TILE_SIZE = 32
+
+##
+# Fast-math flags of the kernels. In contrast to fastmath=True, the flags
+# "nnan" and "ninf" are omitted so that non-finite index coordinates are
+# reliably rejected by the bounds checks.
+FASTMATH_FLAGS = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+if USE_NUMBA:
+
+    ##
+    # Warp the tile [y_start, y_end) x [x_start, x_end) of the resampling grid
+    # of slice i according to its affine index map. The tile is written to
+    # the top left corner of the output arrays.
+    # \date       2026-10-15 19:20:45+0100
+    #
+    # Linear interpolation is used for the slice intensities and nearest
+    # neighbour interpolation for the masks. Equivalently to sitk.Resample,
+    # voxels mapped outside [-0.5, size-0.5) are set to zero and the slice
+    # intensities are clamped at the boundary otherwise.
+    #
+    # \param      slices       (N_slices x Ny_slice x Nx_slice) data array
+    # \param      masks        (N_slices x Ny_slice x Nx_slice) mask array
+    # \param      matrices     (N_slices x 2 x 2) matrices mapping a grid
+    #                          voxel (x, y) to a continuous slice voxel index
+    # \param      offsets      (N_slices x 2) offsets of the index maps
+    # \param      i            Slice index
+    # \param      y_start      First row of the tile
+    # \param      y_end        Row after the last row of the tile
+    # \param      x_start      First column of the tile
+    # \param      x_end        Column after the last column of the tile
+    # \param      warped       2D output data array
+    # \param      warped_mask  2D output mask array
+    #
+    @numba.njit(fastmath=FASTMATH_FLAGS, cache=True, inline="always")
+    def _warp_slice_tile(slices, masks, matrices, offsets, i,
+                         y_start, y_end, x_start, x_end,
+                         warped, warped_mask):
+
+        ny_slice = slices.shape[1]
+        nx_slice = slices.shape[2]
+
+        # Coefficients of the index map are constant for the whole tile
+        m00 = matrices[i, 0, 0]
+        m01 = matrices[i, 0, 1]
+        m10 = matrices[i, 1, 0]
+        m11 = matrices[i, 1, 1]
+        o0 = offsets[i, 0]
+        o1 = offsets[i, 1]
+        cx_max = nx_slice - 0.5
+        cy_max = ny_slice - 0.5
+
+        for y in range(y_start, y_end):
+            # Continuous index of voxel (0, y), i.e. constant part of the row
+            cx_row = m01 * y + o0
+            cy_row = m11 * y + o1
+
+            for x in range(x_start, x_end):
+                cx = cx_row + m00 * x
+                cy = cy_row + m10 * x
+
+                # Written such that NaN coordinates count as outside
+                if not (cx >= -0.5 and cx < cx_max and
+                        cy >= -0.5 and cy < cy_max):
+                    warped[y - y_start, x - x_start] = 0.
+                    warped_mask[y - y_start, x - x_start] = 0
+                    continue
+
+                # Linear interpolation as weighted sum of the four neighbours
+                fx = math.floor(cx)
+                fy = math.floor(cy)
+                wx = cx - fx
+                wy = cy - fy
+                w00 = (1. - wx) * (1. - wy)
+                w01 = wx * (1. - wy)
+                w10 = (1. - wx) * wy
+                w11 = wx * wy
+                x0 = max(int(fx), 0)
+                y0 = max(int(fy), 0)
+                x1 = min(int(fx) + 1, nx_slice - 1)
+                y1 = min(int(fy) + 1, ny_slice - 1)
+                warped[y - y_start, x - x_start] = \
+                    w00 * slices[i, y0, x0] + w01 * slices[i, y0, x1] + \
+                    w10 * slices[i, y1, x0] + w11 * slices[i, y1, x1]
+
+                # Nearest neighbour interpolation
+                xn = min(int(math.floor(cx + 0.5)), nx_slice - 1)
+                yn = min(int(math.floor(cy + 0.5)), ny_slice - 1)
+                warped_mask[y - y_start, x - x_start] = masks[i, yn, xn]
+
+    ##
+    # Warp all slices according to the affine index maps, i.e. compute
+    # slice_i(T(theta_i, x)) for all voxels x of the resampling grid.
+    # \date       2026-10-15 11:02:18+0100
+    #
+    # \param      slices       (N_slices x Ny_slice x Nx_slice) data array
+    # \param      masks        (N_slices x Ny_slice x Nx_slice) mask array
+    # \param      matrices     (N_slices x 2 x 2) matrices mapping a grid
+    #                          voxel (x, y) to a continuous slice voxel index
+    # \param      offsets      (N_slices x 2) offsets of the index maps
+    # \param      warped       (N_slices x Ny x Nx) output data array
+    # \param      warped_mask  (N_slices x Ny x Nx) output mask array
+    #
+    @numba.njit(parallel=True, fastmath=FASTMATH_FLAGS, cache=True)
+    def warp_slices(slices, masks, matrices, offsets, warped, warped_mask):
+
+        for i in numba.prange(warped.shape[0]):
+            _warp_slice_tile(slices, masks, matrices, offsets, i,
+                             0, warped.shape[1], 0, warped.shape[2],
+                             warped[i], warped_mask[i])
+
+    ##
+    # Compute the residuals between neighbouring warped slices, i.e.
+    # slice_i(T(theta_i, x)) - slice_{i+1}(T(theta_{i+1}, x)), including
+    # intensity correction and masking.
+    # \date       2026-10-15 11:19:40+0100
+    #
+    # Warping and differencing are fused and blocked into tiles of
+    # TILE_SIZE x TILE_SIZE grid voxels: For each tile, the slices are warped
+    # in order into two alternating tile buffers and the residual of slice i
+    # and i+1 is computed while both warped tiles are still cached. Hence,
+    # the warped slices are never written to memory. Tiles are processed in
+    # parallel.
+    #
+    # \param      slices       (N_slices x Ny_slice x Nx_slice) data array
+    # \param      masks        (N_slices x Ny_slice x Nx_slice) mask array
+    # \param      matrices     (N_slices x 2 x 2) matrices of index maps
+    # \param      offsets      (N_slices x 2) offsets of the index maps
+    # \param      intensity    (N_slices x 2) array holding scale and bias of
+    #                          the intensity correction for each slice
+    # \param      use_mask     Use masks to eliminate residuals, bool
+    # \param      residual     (N_slices-1 x Ny x Nx) output array
+    #
+    @numba.njit(parallel=True, fastmath=FASTMATH_FLAGS, cache=True)
+    def get_residual_slice_neighbours_fit(slices,
+                                          masks,
+                                          matrices,
+                                          offsets,
+                                          intensity,
+                                          use_mask,
+                                          residual):
+
+        ny = residual.shape[1]
+        nx = residual.shape[2]
+        n_tiles_y = (ny + TILE_SIZE - 1) // TILE_SIZE
+        n_tiles_x = (nx + TILE_SIZE - 1) // TILE_SIZE
+
+        for t in numba.prange(n_tiles_y * n_tiles_x):
+            y_start = (t // n_tiles_x) * TILE_SIZE
+            x_start = (t % n_tiles_x) * TILE_SIZE
+            y_end = min(y_start + TILE_SIZE, ny)
+            x_end = min(x_start + TILE_SIZE, nx)
+
+            # Buffers for the warped tiles of slice i and i+1
+            warped_i = np.empty((TILE_SIZE, TILE_SIZE), dtype=slices.dtype)
+            warped_ip1 = np.empty_like(warped_i)
+            warped_mask_i = np.empty((TILE_SIZE, TILE_SIZE), dtype=masks.dtype)
+            warped_mask_ip1 = np.empty_like(warped_mask_i)
+
+            _warp_slice_tile(slices, masks, matrices, offsets, 0,
+                             y_start, y_end, x_start, x_end,
+                             warped_i, warped_mask_i)
+
+            for i in range(residual.shape[0]):
+                _warp_slice_tile(slices, masks, matrices, offsets, i + 1,
+                                 y_start, y_end, x_start, x_end,
+                                 warped_ip1, warped_mask_ip1)
+
+                a_i = intensity[i, 0]
+                b_i = intensity[i, 1]
+                a_ip1 = intensity[i + 1, 0]
+                b_ip1 = intensity[i + 1, 1]
+
+                for y in range(y_end - y_start):
+                    for x in range(x_end - x_start):
+                        r = (a_i * warped_i[y, x] + b_i) - \
+                            (a_ip1 * warped_ip1[y, x] + b_ip1)
+                        if use_mask:
+                            r *= float(warped_mask_i[y, x]) * \
+                                float(warped_mask_ip1[y, x])
+                        residual[i, y_start + y, x_start + x] = r
+
+                # Warped tile of slice i+1 is reused for the next pair
+                warped_i, warped_ip1 = warped_ip1, warped_i
+                warped_mask_i, warped_mask_ip1 = \
+                    warped_mask_ip1, warped_mask_i
@@ -17,6 +17,8 @@ import SimpleITK as sitk
 import itk
 import numpy as np
 import time
+import scipy.sparse
+import scipy.sparse.linalg
 from datetime import timedelta
 from scipy.optimize import least_squares
 from scipy.optimize import minimize
@@ -68,16 +70,41 @@ class StackRegistrationBase(object):
     #                                               scipy.optimize.least_squares
     #                                               or any method used in
     #                                               "scipy.optimize.minimize",
-    #                                               e.g. "L-BFGS-B".
+    #                                               e.g. "L-BFGS-B", or
+    #                                               "gauss_newton" to use a
+    #                                               Levenberg-Marquardt
+    #                                               damped Gauss-Newton solver
+    #                                               on the sparse normal
+    #                                               equations
     # \param      optimizer_iter_max                Maximum number of
     #                                               iterations/function
-    #                                               evaluations
+    #                                               evaluations; function
+    #                                               evaluations for
+    #                                               "least_squares" and
+    #                                               "gauss_newton"
     # \param      optimizer_loss                    Loss function, e.g.
     #                                               "linear", "soft_l1" or
     #                                               "huber".
     # \param      optimizer_method                  The optimizer method used
     #                                               for "least_squares"
     #                                               algorithm. E.g. "trf"
+    # \param      optimizer_tr_solver               Solver for trust-region
+    #                                               subproblems of
+    #                                               "least_squares", i.e.
+    #                                               "exact" or "lsmr". The
+    #                                               latter exploits sparse
+    #                                               Jacobians.
+    # \param      use_multiresolution_framework     Solve the registration
+    #                                               from coarse to fine
+    #                                               resolution levels, bool
+    # \param      shrink_factors                    Shrink factors of the
+    #                                               resolution levels, e.g.
+    #                                               [2, 1]
+    # \param      smoothing_sigmas                  Standard deviations in
+    #                                               mm of the Gaussian
+    #                                               smoothing applied at
+    #                                               each resolution level,
+    #                                               e.g. [1, 0]
     #
     def __init__(self,
                  stack=None,
@@ -95,6 +122,10 @@ class StackRegistrationBase(object):
                  optimizer_iter_max=20,
                  optimizer_loss="soft_l1",
                  optimizer_method="trf",  # Only counts for least_squares
+                 optimizer_tr_solver="exact",  # Only counts for least_squares
+                 use_multiresolution_framework=False,
+                 shrink_factors=[2, 1],
+                 smoothing_sigmas=[1, 0],
                  ):
 
         # Set Fixed and reference stacks
@@ -118,6 +149,7 @@ class StackRegistrationBase(object):
         self._optimizer_iter_max = optimizer_iter_max
         self._optimizer_loss = optimizer_loss
         self._optimizer_method = optimizer_method
+        self._optimizer_tr_solver = optimizer_tr_solver
 
         # Verbose computation
         self._use_verbose = use_verbose
@@ -146,6 +178,11 @@ class StackRegistrationBase(object):
 
         self._use_parameter_normalization = use_parameter_normalization
 
+        # Multiresolution framework
+        self._use_multiresolution_framework = use_multiresolution_framework
+        self._shrink_factors = shrink_factors
+        self._smoothing_sigmas = smoothing_sigmas
+
         self._ZERO = 1e-8
 
     ##
@@ -305,6 +342,7 @@ class StackRegistrationBase(object):
     # Set maximum number of iterations for optimizer.
     #
     # least_squares: Corresponds to maximum number of function evaluations
+    # gauss_newton: Corresponds to maximum number of function evaluations
     # L-BFGS-B: Corresponds to maximum number of iterations
     # \date       2016-11-10 19:24:35+0000
     #
@@ -358,6 +396,64 @@ class StackRegistrationBase(object):
     def get_optimizer_method(self):
         return self._optimizer_method
 
+    ##
+    #       Sets the solver for trust-region subproblems of least_squares
+    #             optimizer
+    # \date       2026-10-15 14:37:12+0100
+    #
+    # "exact" works on the dense Jacobian whereas "lsmr" directly uses sparse
+    # Jacobians. Only used for optimizer_methods "trf" and "dogbox".
+    #
+    # \param      self                 The object
+    # \param      optimizer_tr_solver  The optimizer_tr_solver in ["exact",
+    #                                  "lsmr"]
+    #
+    # \see        https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.least_squares.html#scipy.optimize.least_squares
+    #
+    def set_optimizer_tr_solver(self, optimizer_tr_solver):
+        if optimizer_tr_solver not in ["exact", "lsmr"]:
+            raise ValueError(
+                "Optimizer optimizer_tr_solver for least_squares must either be 'exact' or 'lsmr'.")
+
+        self._optimizer_tr_solver = optimizer_tr_solver
+
+    def get_optimizer_tr_solver(self):
+        return self._optimizer_tr_solver
+
+    ##
+    #       Use multiresolution framework, i.e. the registration is solved
+    #             on smoothed and downsampled slices first and the result is
+    #             used to warm-start the next finer resolution level.
+    # \date       2026-10-15 18:40:21+0100
+    #
+    # \param      self  The object
+    # \param      flag  The flag, boolean
+    #
+    def use_multiresolution_framework(self, flag):
+        self._use_multiresolution_framework = flag
+
+    ##
+    #       Sets the shrink factors and smoothing sigmas of the resolution
+    #             levels used by the multiresolution framework.
+    # \date       2026-10-15 18:41:05+0100
+    #
+    # \param      self              The object
+    # \param      shrink_factors    Integer shrink factors, e.g. [2, 1]
+    # \param      smoothing_sigmas  Smoothing sigmas in mm, e.g. [1, 0]
+    #
+    def set_multiresolution_levels(self, shrink_factors, smoothing_sigmas):
+        if len(shrink_factors) != len(smoothing_sigmas):
+            raise ValueError(
+                "Number of shrink factors and smoothing sigmas must match.")
+        self._shrink_factors = shrink_factors
+        self._smoothing_sigmas = smoothing_sigmas
+
+    def get_shrink_factors(self):
+        return self._shrink_factors
+
+    def get_smoothing_sigmas(self):
+        return self._smoothing_sigmas
+
     ##
     #       Gets the parameters estimated by registration algorithm.
     # \date       2016-11-06 17:05:38+0000
@@ -490,28 +586,38 @@ class StackRegistrationBase(object):
 
         time_start = ph.start_timing()
 
-        if self._optimizer == "least_squares":
+        if self._optimizer == "gauss_newton":
+            self._print_info_text_gauss_newton()
+        elif self._optimizer == "least_squares":
             self._print_info_text_least_squares()
-            res = self._run_optimizer_least_squares(
-                fun=fun,
-                jac=jac,
-                x0=x0,
-                method=self._optimizer_method,
-                loss=self._optimizer_loss,
-                iter_max=self._optimizer_iter_max,
-                verbose=verbose,
-                x_scale=x_scale)
         else:
             self._print_info_text_minimize()
-            res = self._run_optimizer_minimize(
-                fun=fun,
-                jac=jac,
-                x0=x0,
-                method=self._optimizer,
-                loss=self._optimizer_loss,
-                iter_max=self._optimizer_iter_max,
-                verbose=verbose,
-                x_scale=x_scale)
+
+        if self._use_multiresolution_framework:
+            if len(self._shrink_factors) != len(self._smoothing_sigmas):
+                raise ValueError(
+                    "Number of shrink factors and smoothing sigmas must match.")
+
+            # Solve from coarse to fine resolution levels whereby each level
+            # is initialized by the solution of the previous one
+            res = x0
+            for shrink_factor, smoothing_sigma in zip(
+                    self._shrink_factors, self._smoothing_sigmas):
+                if self._use_verbose:
+                    ph.print_subtitle(
+                        "Resolution level: shrink factor = %d, "
+                        "smoothing sigma = %g" % (
+                            shrink_factor, smoothing_sigma))
+                self._set_multiresolution_level(shrink_factor, smoothing_sigma)
+                res = self._run_optimizer(
+                    fun=fun, jac=jac, x0=res, verbose=verbose, x_scale=x_scale)
+
+            # Restore full resolution for the evaluation of the final costs
+            self._set_multiresolution_level(1, 0)
+
+        else:
+            res = self._run_optimizer(
+                fun=fun, jac=jac, x0=x0, verbose=verbose, x_scale=x_scale)
 
         self._elapsed_time = ph.stop_timing(time_start)
 
@@ -532,20 +638,76 @@ class StackRegistrationBase(object):
         # Apply motion correction and compute slice transforms
         self._apply_motion_correction()
 
+    ##
+    # Run the chosen optimizer
+    # \date       2026-10-15 18:44:37+0100
+    #
+    # \param      self     The object
+    # \param      fun      The residual call
+    # \param      jac      The Jacobian call
+    # \param      x0       The initial value
+    # \param      verbose  The verbose level of the optimizer
+    # \param      x_scale  The parameter scaling
+    #
+    # \return     The obtained parameters as flattened numpy array
+    #
+    def _run_optimizer(self, fun, jac, x0, verbose, x_scale):
+
+        if self._optimizer == "gauss_newton":
+            res = self._run_optimizer_gauss_newton(
+                fun=fun,
+                jac=jac,
+                x0=x0,
+                loss=self._optimizer_loss,
+                iter_max=self._optimizer_iter_max,
+                verbose=verbose)
+        elif self._optimizer == "least_squares":
+            res = self._run_optimizer_least_squares(
+                fun=fun,
+                jac=jac,
+                x0=x0,
+                method=self._optimizer_method,
+                loss=self._optimizer_loss,
+                iter_max=self._optimizer_iter_max,
+                verbose=verbose,
+                x_scale=x_scale)
+        else:
+            res = self._run_optimizer_minimize(
+                fun=fun,
+                jac=jac,
+                x0=x0,
+                method=self._optimizer,
+                loss=self._optimizer_loss,
+                iter_max=self._optimizer_iter_max,
+                verbose=verbose,
+                x_scale=x_scale)
+
+        return res
+
     ##
     # Use scipy.opimize.least_squares solver
     #
     def _run_optimizer_least_squares(self, fun, jac, x0, method, loss, iter_max, verbose, x_scale):
+
+        # Sparse Jacobians are only supported by 'lsmr'
+        if method in ["lm"] or self._optimizer_tr_solver in ["exact"]:
+            jac_ = lambda x: self._get_dense_jacobian(jac(x))
+            tr_solver = None
+        else:
+            jac_ = jac
+            tr_solver = self._optimizer_tr_solver
+
         # Non-linear least-squares optimizer_method:
         res = least_squares(
             fun=fun,
-            jac=jac,
+            jac=jac_,
             x0=x0,
             method=method,
             loss=loss,
             max_nfev=iter_max,
             verbose=verbose,
-            x_scale=x_scale)
+            x_scale=x_scale,
+            tr_solver=tr_solver)
         return res.x
 
     ##
@@ -559,7 +721,7 @@ class StackRegistrationBase(object):
             loss=loss)
         jac_ = lambda x: lf.get_gradient_ell2_cost_from_residual(
             fun(x),
-            jac(x),
+            self._get_dense_jacobian(jac(x)),
             loss=loss)
 
         # Use scipy.optimize.minimize method
@@ -572,6 +734,105 @@ class StackRegistrationBase(object):
         )
         return res.x
 
+    ##
+    # Use Levenberg-Marquardt damped Gauss-Newton solver
+    # \date       2026-10-15 16:48:09+0100
+    #
+    # Each iteration solves the normal equations
+    # (J'WJ + lambda diag(J'WJ)) dx = -J'Wf with a sparse factorization and
+    # thereby exploits the block structure of the Jacobian, i.e. only
+    # neighbouring slices are coupled. Robust loss functions are accounted
+    # for by iteratively reweighted least squares with weights
+    # W = rho'(f^2). Due to the Marquardt scaling the steps are invariant to
+    # the parameter scaling, i.e. no x_scale is required.
+    #
+    # \param      self      The object
+    # \param      fun       Residual function
+    # \param      jac       Jacobian of residual function
+    # \param      x0        Initial value
+    # \param      loss      Loss function rho
+    # \param      iter_max  Maximum number of function evaluations
+    #                       (including the initial one and those of rejected
+    #                       steps), i.e. equivalent to max_nfev of
+    #                       least_squares
+    # \param      verbose   Print progress of iterations if verbose > 1
+    #
+    # \return     Parameters after optimization as numpy array
+    #
+    def _run_optimizer_gauss_newton(self, fun, jac, x0, loss, iter_max, verbose):
+
+        damping = 1e-3
+        damping_max = 1e10
+        tolerance = 1e-8
+
+        x = np.array(x0, dtype=np.float64)
+        f = fun(x)
+        nfev = 1
+        cost = lf.get_ell2_cost_from_residual(f, loss=loss)
+
+        if verbose > 1:
+            print("%10s%15s%15s%15s" %
+                  ("Iteration", "Cost", "Step norm", "Damping"))
+            print("%10d%15.4e%15s%15s" % (0, cost, "", ""))
+
+        iteration = 0
+        while nfev < iter_max:
+            iteration += 1
+
+            # Gauss-Newton approximation of Hessian and gradient
+            weights = np.sqrt(lf.get_gradient_loss[loss](f2=f**2))
+            jacobian = scipy.sparse.diags(weights).dot(
+                scipy.sparse.csr_matrix(jac(x)))
+            hessian = jacobian.transpose().dot(jacobian).tocsc()
+            gradient = jacobian.transpose().dot(weights * f)
+
+            diagonal = hessian.diagonal()
+            diagonal = np.maximum(diagonal, self._ZERO * diagonal.max())
+
+            # Increase damping until the cost decreases
+            step_accepted = False
+            while damping <= damping_max and nfev < iter_max:
+                step = scipy.sparse.linalg.spsolve(
+                    hessian + scipy.sparse.diags(damping * diagonal),
+                    -gradient)
+                f_new = fun(x + step)
+                nfev += 1
+                cost_new = lf.get_ell2_cost_from_residual(f_new, loss=loss)
+                if cost_new < cost:
+                    step_accepted = True
+                    break
+                damping *= 10.
+
+            if not step_accepted:
+                break
+
+            cost_reduction = cost - cost_new
+            x = x + step
+            f = f_new
+            cost = cost_new
+            damping = max(damping / 10., 1e-10)
+
+            if verbose > 1:
+                print("%10d%15.4e%15.2e%15.1e" %
+                      (iteration, cost, np.linalg.norm(step), damping))
+
+            if cost_reduction < tolerance * cost or \
+                    np.linalg.norm(step) < \
+                    tolerance * (tolerance + np.linalg.norm(x)):
+                break
+
+        return x
+
+    ##
+    # Gets the Jacobian as dense numpy array in case it is given as sparse
+    # matrix.
+    #
+    @staticmethod
+    def _get_dense_jacobian(jacobian):
+        if scipy.sparse.issparse(jacobian):
+            return jacobian.toarray()
+        return jacobian
+
     @abstractmethod
     def _print_info_text_least_squares(self):
         pass
@@ -580,6 +841,10 @@ class StackRegistrationBase(object):
     def _print_info_text_minimize(self):
         pass
 
+    @abstractmethod
+    def _print_info_text_gauss_newton(self):
+        pass
+
     ##
     #       optimizer_Method to initialize the registration with all
     #             precomputations which can be done before the actual
@@ -642,3 +907,16 @@ class StackRegistrationBase(object):
     @abstractmethod
     def _apply_motion_correction(self):
         pass
+
+    ##
+    #       Sets the resolution level used by the multiresolution
+    #             framework.
+    # \date       2026-10-15 18:46:12+0100
+    #
+    # \param      self             The object
+    # \param      shrink_factor    The shrink factor, integer
+    # \param      smoothing_sigma  The smoothing sigma in mm
+    #
+    @abstractmethod
+    def _set_multiresolution_level(self, shrink_factor, smoothing_sigma):
+        pass
@@ -13,7 +13,6 @@ import numpy as np
 import unittest
 import sys
 import os
-from scipy.ndimage import imread
 
 import pysitk.simple_itk_helper as sitkh
 import pysitk.python_helper as ph
@@ -21,6 +20,7 @@ import pysitk.python_helper as ph
 # Import modules
 import niftymic.base.stack as st
 import niftymic.registration.intra_stack_registration as inplanereg
+import niftymic.registration.slice_warping as sw
 
 from niftymic.definitions import DIR_TEST
 
@@ -137,6 +137,49 @@ def get_inplane_corrupted_stack(stack,
     return stack_corrupted, motion_sitk, motion_2_sitk
 
 
+##
+# Gets a synthetic stack of smooth blobs (with mask) whose slices are
+# slightly displaced in-plane w.r.t. each other.
+# \date       2026-10-16 09:41:12+0100
+#
+# \param      shape           The shape of the stack as (z, y, x)
+# \param      translations_2D  In-plane translations in voxels of the blobs
+#                             for each slice as (z x 2) numpy array in (x,
+#                             y)-order; None yields random displacements
+# \param      seed            Seed for random displacements
+#
+# \return     The synthetic stack as Stack object
+#
+def get_synthetic_stack(shape=(8, 48, 56), translations_2D=None, seed=0):
+
+    shape_z, shape_y, shape_x = shape
+    if translations_2D is None:
+        translations_2D = np.random.RandomState(seed).randn(shape_z, 2) * 1.5
+
+    yy, xx = np.mgrid[0:shape_y, 0:shape_x].astype(np.float64)
+    nda = np.zeros(shape)
+    for i in range(0, shape_z):
+        cx = shape_x / 2. + translations_2D[i, 0]
+        cy = shape_y / 2. + translations_2D[i, 1]
+        nda[i, :, :] = \
+            100 * np.exp(-(((yy - cy) / 9.)**2 + ((xx - cx) / 13.)**2)) + \
+            30 * np.exp(-(((yy - cy - 6) / 4.)**2 + ((xx - cx + 5) / 4.)**2))
+
+    stack_sitk = sitk.GetImageFromArray(nda)
+    stack_sitk.SetSpacing((0.8, 0.9, 3.0))
+    stack_sitk.SetOrigin((10., -5., 2.))
+    rotation_sitk = sitk.Euler3DTransform()
+    rotation_sitk.SetRotation(0.1, -0.2, 0.3)
+    stack_sitk.SetDirection(rotation_sitk.GetMatrix())
+    stack_sitk_mask = sitk.Cast(stack_sitk > 20, sitk.sitkUInt8)
+
+    return st.Stack.from_sitk_image(
+        stack_sitk,
+        slice_thickness=3.0,
+        filename="synthetic",
+        image_sitk_mask=stack_sitk_mask)
+
+
 class IntraStackRegistrationTest(unittest.TestCase):
 
     # Specify input data
@@ -144,6 +187,11 @@ class IntraStackRegistrationTest(unittest.TestCase):
 
     accuracy = 6
 
+    # In-plane translations (voxels) of the slices of synthetic stacks
+    translations_2D = np.array([
+        [0, 0], [1.5, -1], [-1, 2], [0.5, 1],
+        [2, -1.5], [-1.5, -0.5], [1, 1], [0, -2]])
+
     def setUp(self):
         pass
 
@@ -465,6 +513,7 @@ class IntraStackRegistrationTest(unittest.TestCase):
     #
     def test_initial_intensity_coefficient_computation(self):
         # Create stack
+        from scipy.ndimage import imread
         shape_z = 15
         nda_2D = imread(self.dir_test_data + "2D_Lena_256.png", flatten=True)
         nda_3D = np.tile(nda_2D, (shape_z, 1, 1)).astype('double')
@@ -1172,3 +1221,233 @@ class IntraStackRegistrationTest(unittest.TestCase):
 
         self.assertEqual(np.round(
             np.linalg.norm(stack_diff_nda), decimals=8), 0)
+
+    ##
+    #       Verify that the residual and Jacobian of the slice neighbour
+    #             fit based on batched array resampling (numba kernels and
+    #             numpy fallback) match the SimpleITK implementation.
+    # \date       2026-10-16 09:48:30+0100
+    #
+    # \param      self  The object
+    #
+    def test_slice_neighbours_fit_against_sitk(self):
+
+        # Perturbation of the initial parameters for each transform type
+        perturbations = {
+            "rigid": np.array([0.05, 1, 1]),
+            "similarity": np.array([0.02, 0.05, 1, 1]),
+            "affine": np.array([0.02, 0.02, 0.02, 0.02, 1, 1]),
+        }
+        settings = [
+            dict(transform_type="rigid"),
+            dict(transform_type="rigid", use_stack_mask=True,
+                 intensity_correction_type_slice_neighbour_fit="affine"),
+            dict(transform_type="similarity", use_stack_mask=True,
+                 intensity_correction_type_slice_neighbour_fit="linear"),
+            dict(transform_type="affine", use_stack_mask=True),
+        ]
+
+        use_numba = sw.USE_NUMBA
+        flags_numba = [False, True] if use_numba else [False]
+
+        try:
+            for flag_numba in flags_numba:
+                sw.USE_NUMBA = flag_numba
+                for setting in settings:
+                    rng = np.random.RandomState(1)
+                    inplane_registration = \
+                        inplanereg.IntraStackRegistration(
+                            get_synthetic_stack(shape=(5, 21, 25)),
+                            **setting)
+                    inplane_registration._run_registration_pipeline_initialization()
+                    self._set_itk_transforms(inplane_registration)
+
+                    parameters = np.array(
+                        inplane_registration.get_parameters())
+                    dofs = inplane_registration._transform_type_dofs
+                    parameters[:, 0:dofs] += \
+                        rng.randn(parameters.shape[0], dofs) * \
+                        perturbations[setting["transform_type"]]
+                    parameters = parameters.flatten()
+
+                    residual = inplane_registration.\
+                        _get_residual_slice_neighbours_fit(parameters)
+                    residual_sitk = inplane_registration.\
+                        _get_residual_slice_neighbours_fit_sitk(parameters)
+                    self.assertAlmostEqual(
+                        np.linalg.norm(residual - residual_sitk) /
+                        np.linalg.norm(residual_sitk), 0, places=5)
+
+                    jacobian = inplane_registration.\
+                        _get_jacobian_residual_slice_neighbours_fit(
+                            parameters).toarray()
+                    jacobian_sitk = inplane_registration.\
+                        _get_jacobian_residual_slice_neighbours_fit_sitk(
+                            parameters)
+                    self.assertAlmostEqual(
+                        np.linalg.norm(jacobian - jacobian_sitk) /
+                        np.linalg.norm(jacobian_sitk), 0, places=5)
+        finally:
+            sw.USE_NUMBA = use_numba
+
+    ##
+    #       Verify that in-plane rigid registration to neighbouring slices
+    #             works with the Gauss-Newton optimizer as it does with
+    #             least_squares, i.e. the relative in-plane motion of the
+    #             slices is recovered.
+    # \date       2026-10-16 10:21:05+0100
+    #
+    # \param      self  The object
+    #
+    def test_inplane_rigid_alignment_to_neighbour_gauss_newton(self):
+
+        for optimizer in ["least_squares", "gauss_newton"]:
+            inplane_registration = inplanereg.IntraStackRegistration(
+                get_synthetic_stack(translations_2D=self.translations_2D),
+                transform_type="rigid",
+                use_stack_mask=True,
+                optimizer=optimizer,
+                optimizer_loss="linear",
+                optimizer_iter_max=20,
+            )
+            inplane_registration.run()
+
+            self._assert_relative_inplane_motion(
+                inplane_registration.get_parameters(),
+                self.translations_2D)
+
+    ##
+    #       Verify that the Gauss-Newton optimizer respects the maximum
+    #             number of function evaluations
+    # \date       2026-10-16 10:24:43+0100
+    #
+    # \param      self  The object
+    #
+    def test_gauss_newton_function_evaluations(self):
+
+        inplane_registration = inplanereg.IntraStackRegistration()
+
+        # Rosenbrock problem in residual form
+        nfev = [0]
+
+        def fun(x):
+            nfev[0] += 1
+            return np.array([10 * (x[1] - x[0]**2), 1 - x[0]])
+
+        def jac(x):
+            return np.array([[-20 * x[0], 10], [-1, 0]])
+
+        for iter_max in [1, 2, 5, 10]:
+            nfev[0] = 0
+            inplane_registration._run_optimizer_gauss_newton(
+                fun, jac, np.array([-1.2, 1.]), "linear", iter_max, 0)
+            self.assertLessEqual(nfev[0], iter_max)
+
+        x = inplane_registration._run_optimizer_gauss_newton(
+            fun, jac, np.array([-1.2, 1.]), "linear", 100, 0)
+        self.assertEqual(np.round(
+            np.linalg.norm(x - np.ones(2)), decimals=self.accuracy), 0)
+
+    ##
+    #       Verify that in-plane rigid registration to neighbouring slices
+    #             works within the multiresolution framework. Odd slice
+    #             sizes are used so that binned slices, masks and resampling
+    #             grid need to share their geometry.
+    # \date       2026-10-16 11:05:52+0100
+    #
+    # \param      self  The object
+    #
+    def test_inplane_rigid_alignment_to_neighbour_multiresolution(self):
+
+        for use_numba in set([False, sw.USE_NUMBA]):
+            flag_numba = sw.USE_NUMBA
+            try:
+                sw.USE_NUMBA = use_numba
+                inplane_registration = inplanereg.IntraStackRegistration(
+                    get_synthetic_stack(
+                        shape=(8, 47, 55),
+                        translations_2D=self.translations_2D),
+                    transform_type="rigid",
+                    use_stack_mask=True,
+                    optimizer_loss="linear",
+                    optimizer_iter_max=20,
+                    use_multiresolution_framework=True,
+                    shrink_factors=[4, 2, 1],
+                    smoothing_sigmas=[2, 1, 0],
+                )
+                inplane_registration.run()
+            finally:
+                sw.USE_NUMBA = flag_numba
+
+            self._assert_relative_inplane_motion(
+                inplane_registration.get_parameters(),
+                self.translations_2D)
+
+            # Full resolution is restored after registration
+            self.assertEqual(
+                inplane_registration._slices_2D_nda.shape, (8, 47, 55))
+
+        # Binned slices, masks and resampling grid share their geometry:
+        # At identity, the warped slices coincide with the binned slices and
+        # the mask of each bin covers at least half of it
+        inplane_registration = inplanereg.IntraStackRegistration(
+            get_synthetic_stack(shape=(4, 47, 55)),
+            use_stack_mask=True,
+            use_multiresolution_framework=True)
+        inplane_registration._run_registration_pipeline_initialization()
+        nda_mask = np.array([
+            sitk.GetArrayFromImage(s.sitk_mask)
+            for s in inplane_registration._slices_2D])
+        inplane_registration._set_multiresolution_level(2, 0)
+        slices_nda, slices_nda_mask = \
+            inplane_registration._get_warped_slices_2D_nda(
+                inplane_registration.get_parameters())
+        self.assertEqual(slices_nda.shape, (4, 23, 27))
+        self.assertAlmostEqual(np.max(np.abs(
+            slices_nda - inplane_registration._slices_2D_nda)), 0, places=4)
+        nda_mask_binned = nda_mask[:, 0:46, 0:54].reshape(
+            4, 23, 2, 27, 2).mean(axis=(2, 4)) >= 0.5
+        self.assertTrue(np.array_equal(
+            slices_nda_mask.astype(bool), nda_mask_binned))
+
+        # Unsupported settings are rejected when the option is set
+        stack = get_synthetic_stack()
+        with self.assertRaises(ValueError):
+            inplanereg.IntraStackRegistration(
+                stack, reference=stack, use_multiresolution_framework=True)
+        inplane_registration = inplanereg.IntraStackRegistration(
+            stack, interpolator="NearestNeighbor")
+        with self.assertRaises(ValueError):
+            inplane_registration.use_multiresolution_framework(True)
+
+    ##
+    # Asserts that the registration parameters recover the relative in-plane
+    # motion of get_synthetic_stack up to a common transform of all slices
+    #
+    def _assert_relative_inplane_motion(self, parameters, translations_2D):
+        spacing_2D = np.array([0.8, 0.9])
+        angles = parameters[:, 0] - parameters[0, 0]
+        translations = parameters[:, 1:3] - parameters[0, 1:3]
+        translations_expected = \
+            (translations_2D - translations_2D[0]) * spacing_2D
+        self.assertLess(np.max(np.abs(angles)), 5e-3)
+        self.assertLess(np.max(np.abs(
+            translations - translations_expected)), 0.1)
+
+    ##
+    # Sets the itk transforms used for the Jacobian computation as done in
+    # StackRegistrationBase.run
+    #
+    @staticmethod
+    def _set_itk_transforms(inplane_registration):
+        transform_type = inplane_registration.get_transform_type()
+        transforms_2D_itk = []
+        for transform_sitk in inplane_registration._transforms_2D_sitk:
+            transform_itk = \
+                inplane_registration._new_transform_itk[transform_type]()
+            transform_itk.SetParameters(itk.OptimizerParameters[itk.D](
+                transform_sitk.GetParameters()))
+            transform_itk.SetFixedParameters(itk.OptimizerParameters[itk.D](
+                transform_sitk.GetFixedParameters()))
+            transforms_2D_itk.append(transform_itk)
+        inplane_registration._transforms_2D_itk = transforms_2D_itk